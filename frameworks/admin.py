@@ -1,29 +1,158 @@
+import time
+
 from django.contrib import admin
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import OperationalError, connections, transaction
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
 from .models import Framework, Criterion, Definition
+from .search import build_match_expression, fts_available
+
+
+class TimeLimitedPaginator(Paginator):
+    """
+    Paginator whose COUNT(*) is abandoned after a short time limit, so huge
+    tables don't block the changelist. Small tables keep their exact count.
+    """
+    count_timeout_ms = 200
+    fallback_count = 9999999999
+
+    @cached_property
+    def count(self):
+        db = getattr(self.object_list, 'db', None)
+        if db is None:
+            return super().count
+
+        connection = connections[db]
+        try:
+            if connection.vendor == 'postgresql':
+                with transaction.atomic(using=db), connection.cursor() as cursor:
+                    cursor.execute(f'SET LOCAL statement_timeout TO {self.count_timeout_ms}')
+                    return self.object_list.count()
+            if connection.vendor == 'sqlite':
+                # SQLite has no statement timeout; abort from the progress handler instead
+                connection.ensure_connection()
+                deadline = time.monotonic() + self.count_timeout_ms / 1000
+                connection.connection.set_progress_handler(lambda: time.monotonic() > deadline, 10000)
+                try:
+                    return self.object_list.count()
+                finally:
+                    connection.connection.set_progress_handler(None, 0)
+            return self.object_list.count()
+        except OperationalError:
+            return self.fallback_count
+
+
+class FullTextSearchMixin:
+    """Search through an FTS5 index instead of LIKE scans over long text columns"""
+    fts_table = None
+    # Short columns still matched with icontains alongside the FTS lookup
+    fts_extra_search_fields = []
+
+    def get_search_results(self, request, queryset, search_term):
+        match = build_match_expression(search_term)
+        if not (self.fts_table and match and fts_available(connections[queryset.db])):
+            return super().get_search_results(request, queryset, search_term)
+
+        matching_ids = RawSQL(
+            f'SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH %s',
+            [match],
+        )
+        condition = Q(pk__in=matching_ids)
+        for field in self.fts_extra_search_fields:
+            condition |= Q(**{f'{field}__icontains': search_term})
+        return queryset.filter(condition), False
+
+
+class ChangeListColumnsMixin:
+    """
+    Load only `changelist_only_fields` on changelist pages, so large text
+    columns that aren't displayed are never fetched. Change forms still use
+    the full get_queryset().
+    """
+    changelist_only_fields = None
+
+    def get_changelist(self, request, **kwargs):
+        changelist_class = super().get_changelist(request, **kwargs)
+        only_fields = self.changelist_only_fields
+        if not only_fields:
+            return changelist_class
+
+        class ColumnRestrictedChangeList(changelist_class):
+            def get_queryset(self, request, *args, **kwargs):
+                return super().get_queryset(request, *args, **kwargs).only(*only_fields)
+
+        return ColumnRestrictedChangeList
+
+
+class DefinitionFrameworkFilter(admin.SimpleListFilter):
+    """Filter definitions by framework, with the sidebar choices cached"""
+    title = 'framework'
+    parameter_name = 'framework'
+    cache_key = 'admin:definition_framework_filter'
+    cache_timeout = 300
+
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            self.cache_key,
+            lambda: [(str(fw.pk), str(fw)) for fw in Framework.objects.only('id', 'name', 'year')],
+            self.cache_timeout,
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() and self.value().isdigit():
+            return queryset.filter(criterion__framework_id=self.value())
+        return queryset
 
 
 @admin.register(Framework)
-class FrameworkAdmin(admin.ModelAdmin):
+class FrameworkAdmin(ChangeListColumnsMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['name', 'authors', 'year', 'title', 'created_at']
     list_filter = ['year', 'created_at']
     search_fields = ['name', 'authors', 'title', 'description']
+    fts_table = 'frameworks_framework_fts'
     readonly_fields = ['created_at', 'updated_at']
+    changelist_only_fields = ['name', 'authors', 'year', 'title', 'created_at']
+    paginator = TimeLimitedPaginator
+    show_full_result_count = False
 
 
 @admin.register(Criterion)
-class CriterionAdmin(admin.ModelAdmin):
+class CriterionAdmin(ChangeListColumnsMixin, admin.ModelAdmin):
     list_display = ['name', 'framework', 'category', 'order']
     list_filter = ['framework', 'category']
     search_fields = ['name', 'description', 'framework__name']
     ordering = ['framework', 'order', 'name']
+    autocomplete_fields = ['framework']
+    changelist_only_fields = ['name', 'category', 'order', 'framework', 'framework__name', 'framework__year']
+    paginator = TimeLimitedPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Criterion.__str__ reads framework.name; this queryset also backs the
+        # autocomplete endpoint used by DefinitionAdmin, not just the changelist
+        return super().get_queryset(request).select_related('framework')
 
 
 @admin.register(Definition)
-class DefinitionAdmin(admin.ModelAdmin):
+class DefinitionAdmin(ChangeListColumnsMixin, FullTextSearchMixin, admin.ModelAdmin):
     list_display = ['criterion', 'definition_text_preview', 'created_at']
-    list_filter = ['criterion__framework', 'created_at']
+    list_filter = [DefinitionFrameworkFilter, 'created_at']
     search_fields = ['definition_text', 'criterion__name', 'notes']
-    
+    fts_table = 'frameworks_definition_fts'
+    fts_extra_search_fields = ['criterion__name']
+    autocomplete_fields = ['criterion']
+    # definition_text itself is never loaded; the stored preview column is read instead
+    changelist_only_fields = ['preview', 'created_at', 'criterion', 'criterion__name', 'criterion__framework', 'criterion__framework__name']
+    paginator = TimeLimitedPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        # Criterion.__str__ reads criterion.framework.name, so join both FKs
+        return super().get_queryset(request).select_related('criterion', 'criterion__framework')
+
     def definition_text_preview(self, obj):
-        return obj.definition_text[:100] + "..." if len(obj.definition_text) > 100 else obj.definition_text
+        return obj.preview[:100] + "..." if len(obj.preview) > 100 else obj.preview
     definition_text_preview.short_description = 'Definition Preview'
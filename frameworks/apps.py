@@ -1,5 +1,10 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class FrameworksConfig(AppConfig):
     name = 'frameworks'
+
+    def ready(self):
+        from .search import install_fts_after_migrate
+        post_migrate.connect(install_fts_after_migrate, sender=self)
@@ -3,8 +3,19 @@ LLM-enhanced criteria comparison for better semantic matching and insights.
 Supports multiple LLM providers: OpenAI, Ollama, or sentence transformers.
 """
 import os
+import re
 import json
+import time
+import socket
+import asyncio
+import hashlib
+import inspect
+import contextvars
+import importlib.util
+import functools
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Tuple
 try:
     from django.conf import settings
@@ -14,49 +25,582 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
-# Try to import LLM libraries
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-
-try:
-    import ollama
-    OLLAMA_AVAILABLE = True
-except ImportError:
-    OLLAMA_AVAILABLE = False
+# Check which LLM libraries are installed without importing them; the heavy
+# ones (torch via sentence_transformers, openai, huggingface_hub) are only
+# imported by the provider that ends up being used.
+def _installed(*modules: str) -> bool:
+    try:
+        return all(importlib.util.find_spec(module) is not None for module in modules)
+    except (ImportError, ValueError):
+        return False
 
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
 
+OPENAI_AVAILABLE = _installed('openai')
+OLLAMA_AVAILABLE = _installed('ollama')
 # Hugging Face Inference API (free tier)
-try:
-    from huggingface_hub import InferenceClient
-    HUGGINGFACE_AVAILABLE = True
-except ImportError:
-    HUGGINGFACE_AVAILABLE = False
+HUGGINGFACE_AVAILABLE = _installed('huggingface_hub')
+SENTENCE_TRANSFORMERS_AVAILABLE = _installed('sentence_transformers', 'numpy')
+# HTTP/2 support for httpx (installed with openai/ollama) needs the h2 package
+HTTP2_AVAILABLE = _installed('h2')
+# Repairs malformed JSON (unquoted keys, trailing commas, truncation) in LLM output
+JSON_REPAIR_AVAILABLE = _installed('json_repair')
+# Faster JSON encoding/decoding; the stdlib json module is used without it
+ORJSON_AVAILABLE = _installed('orjson')
+if ORJSON_AVAILABLE:
+    import orjson
+
+# Number of criteria summarized per batched LLM request
+SUMMARY_BATCH_SIZE = 10
+
+# Maximum number of LLM requests in flight at once on the async path
+MAX_CONCURRENT_REQUESTS = 20
+
+# Default request rate limits of hosted providers (requests per minute); the
+# LLM_REQUESTS_PER_MINUTE setting overrides them. Local Ollama isn't limited.
+PROVIDER_REQUESTS_PER_MINUTE = {'openai': 500, 'huggingface': 60}
+
+# Retries of a rate-limited (HTTP 429) request, with exponential backoff from RATE_LIMIT_BACKOFF seconds
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0
+
+# JSON schemas for grammar-constrained output on Hugging Face (TGI) endpoints
+NAME_LISTS_SCHEMA = {"type": "object", "additionalProperties": {"type": "array", "items": {"type": "string"}}}
+SUMMARIES_SCHEMA = {"type": "object", "additionalProperties": {"type": "string"}}
+
+# Django cache alias holding persisted LLM responses and embeddings
+LLM_CACHE_ALIAS = 'llm'
+
+# Responses sampled above this temperature are meant to vary and aren't cached
+CACHEABLE_MAX_TEMPERATURE = 0.4
+
+# In-process layer in front of the LLM cache: cache key -> response
+RESPONSE_MEMORY_MAX_ENTRIES = 2048
+_response_memory: Dict[str, Any] = {}
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Vectors kept in the engine's in-process embedding store before it is reset
+EMBEDDING_STORE_MAX_ENTRIES = 20000
+
+# Cosine similarity at which two criteria end up in the same group
+GROUP_SIMILARITY_THRESHOLD = 0.5
+
+# Rows of the similarity matrix computed at a time when grouping
+GROUP_SIMILARITY_BLOCK = 1024
+
+# Criteria whose own description is at least this long and already names the
+# framework don't get an LLM-enhanced description in comparisons
+ENHANCED_DESCRIPTION_SKIP_CHARS = 200
+
+# Longest description, definition and category text put into a prompt (characters)
+PROMPT_DESCRIPTION_CHARS = 400
+PROMPT_DEFINITION_CHARS = 200
+PROMPT_CATEGORY_CHARS = 100
+
+# Description characters embedded per criterion; MiniLM truncates at 256 tokens anyway
+EMBEDDING_DESCRIPTION_CHARS = 200
+
+# Local Ollama server address, and how long a probe result is reused before
+# the server is checked again (seconds)
+OLLAMA_ADDRESS = ('127.0.0.1', 11434)
+OLLAMA_PROBE_TIMEOUT = 0.1
+PROVIDER_PROBE_TTL = 300
+
+# How long the call path that works for a Hugging Face model (chat completion
+# or plain text generation) is remembered (seconds)
+HF_CAPABILITY_TTL = 24 * 60 * 60
+
+# Per-request timeouts for hosted LLM API clients (seconds), so a hung request
+# gives up instead of blocking the whole comparison, and for the startup health
+# check. The local Ollama server keeps no timeout: CPU models can take minutes.
+LLM_REQUEST_TIMEOUT = 15.0
+LLM_CONNECT_TIMEOUT = 3.0
+PROVIDER_HEALTH_TIMEOUT = 3.0
+
+# Connection pool limits for the HTTP clients handed to openai/ollama
+HTTP_POOL_LIMITS = {'max_connections': 50, 'max_keepalive_connections': MAX_CONCURRENT_REQUESTS, 'keepalive_expiry': 90}
+
+# (async client, semaphore) for the running asyncio.run(); kept in a context
+# variable rather than on the engine because the engine is shared across threads
+_async_session = contextvars.ContextVar('llm_async_session', default=None)
+
+# Pre-quantized int8 ONNX exports shipped with the embedding model, by CPU architecture
+EMBEDDING_ONNX_FILES = {
+    'x86_64': 'onnx/model_qint8_avx512_vnni.onnx',
+    'amd64': 'onnx/model_qint8_avx512_vnni.onnx',
+    'arm64': 'onnx/model_qint8_arm64.onnx',
+    'aarch64': 'onnx/model_qint8_arm64.onnx',
+}
+
+
+# Prompt templates, filled in with str.format(); literal braces are doubled
+COMPARISON_SUMMARIES_PROMPT = """Compare how different knowledge graph quality frameworks define each of the criteria below.
+
+{criteria_text}
+
+For each criterion, provide a concise 2-3 sentence summary highlighting:
+1. Key similarities in how frameworks define this criterion
+2. Notable differences or unique perspectives
+3. Any important nuances
+
+Be specific and factual. Return a JSON object where keys are the criterion names exactly as given and values are the summary texts, no markdown formatting. Format:
+{{"Criterion Name": "Summary text"}}
+
+Return only valid JSON, no other text."""
+
+SIMILARITIES_PROMPT = """Analyze these knowledge graph quality criteria and identify which ones are semantically similar or conceptually related, even if they have different names.
+
+Criteria:
+{criteria_text}
+
+Return a JSON object where keys are criterion names and values are lists of similar criterion names. Only include criteria that are genuinely similar (same concept, different wording). Format:
+{{"Criterion Name": ["Similar Criterion 1", "Similar Criterion 2"]}}
+
+Return only valid JSON, no other text."""
+
+COMPARISON_SUMMARY_PROMPT = """Compare how different knowledge graph quality frameworks define the criterion "{criterion_name}".
+
+Definitions:
+{definitions_text}
+
+Provide a concise 2-3 sentence summary highlighting:
+1. Key similarities in how frameworks define this criterion
+2. Notable differences or unique perspectives
+3. Any important nuances
+
+Be specific and factual. Return only the summary text, no markdown formatting."""
+
+CRITERION_INSIGHTS_PROMPT = """Analyze how different knowledge graph quality frameworks approach each of the criteria below.
+
+{criteria_text}
+
+For each criterion, provide 2-3 sentences highlighting:
+1. Key differences in how frameworks implement or measure this criterion
+2. Which framework has the most comprehensive approach
+3. Any practical implications or recommendations
+
+Be concise and actionable. Return a JSON object where keys are the criterion names exactly as given and values are the insight texts, no markdown. Format:
+{{"Criterion Name": "Insight text"}}
+
+Return only valid JSON, no other text."""
+
+CRITERION_INSIGHT_PROMPT = """Analyze how different knowledge graph quality frameworks approach the criterion "{criterion_name}".
+
+Framework approaches:
+{approaches}
+
+Provide 2-3 sentences highlighting:
+1. Key differences in how frameworks implement or measure this criterion
+2. Which framework has the most comprehensive approach
+3. Any practical implications or recommendations
+
+Be concise and actionable. Return only the insight text, no markdown."""
+
+ENHANCED_DESCRIPTION_PROMPT = """You are analyzing knowledge graph quality frameworks. Provide a clear, comprehensive 2-3 sentence description of the criterion "{criterion_name}" SPECIFICALLY as it is used in the framework "{framework_name}".
+
+{framework_context}
+
+IMPORTANT: Your description must be specific to how {framework_name} defines and uses this criterion. Do not provide a generic description. Focus on:
+1. How THIS SPECIFIC FRAMEWORK ({framework_name}) defines or measures this criterion
+2. What makes this criterion's interpretation unique or notable in {framework_name}
+3. The practical significance of this criterion within {framework_name}'s approach
+
+Return only the description text, no markdown, no labels, no quotes."""
+
+UNIQUE_CRITERION_CONTEXT = """The criterion "{criterion_name}" appears only in the framework "{framework_name}" but not in: {other_frameworks}.
+
+Details from {framework_name}:
+- Category: {category}
+- Description: {description}
+- Definitions: {definitions}"""
+
+UNIQUE_INSIGHTS_PROMPT = """Each of the criteria below appears in only one of the compared knowledge graph quality frameworks.
+
+{criteria_text}
+
+For each criterion, provide a brief 1-2 sentence insight about:
+1. Why this criterion might be unique to this framework
+2. Its potential importance or relevance
+
+Be concise. Return a JSON object where keys are the criterion names exactly as given and values are the insight texts. Format:
+{{"Criterion Name": "Insight text"}}
+
+Return only valid JSON, no other text."""
+
+UNIQUE_INSIGHT_PROMPT = """{context}
+
+Provide a brief 1-2 sentence insight about:
+1. Why this criterion might be unique to this framework
+2. Its potential importance or relevance
+
+Be concise. Return only the insight text."""
+
+OVERALL_INSIGHTS_PROMPT = """Analyze this comparison of {framework_count} knowledge graph quality frameworks: {framework_names}.
+
+Statistics:
+- Total unique criteria: {total_criteria}
+- Criteria in all frameworks: {common_criteria}
+- Criteria unique to one framework: {unique_criteria}
+- Semantically similar criteria pairs: {similar_pairs}
+
+Provide 3-4 sentences with overall insights:
+1. Key strengths of each framework
+2. Major differences in approach
+3. Recommendations for choosing or combining frameworks
+4. Notable gaps or overlaps
+
+Be insightful and practical. Return only the insight text, no markdown."""
+
+GROUPING_PROMPT = """Group these knowledge graph quality criteria into related categories based on their conceptual similarity.
+
+Criteria:
+{criteria_text}
+
+Return a JSON object with category names as keys and lists of criterion names as values. Use meaningful category names like "Completeness-related", "Accuracy-related", etc.
+
+Format: {{"Category Name": ["Criterion 1", "Criterion 2"]}}
+
+Return only valid JSON."""
+
+
+def _clip(text: Optional[str], limit: int) -> str:
+    """Collapse whitespace and cut text to at most `limit` characters for a prompt"""
+    return ' '.join((text or '').split())[:limit].rstrip()
+
+
+def _clip_definitions(definitions: Optional[List[str]], count: int = 2) -> List[str]:
+    """The first `count` non-empty definitions, clipped for a prompt"""
+    clipped = (_clip(d, PROMPT_DEFINITION_CHARS) for d in (definitions or [])[:count])
+    return [d for d in clipped if d]
+
+
+# strict=False accepts raw newlines/tabs inside strings, which LLMs often emit
+_JSON_DECODER = json.JSONDecoder(strict=False)
+
+
+# End of a sentence: terminator followed by whitespace and a capitalized word,
+# so abbreviations like "e.g. the" don't count
+_SENTENCE_END_RE = re.compile(r'[.!?]["\')\]]?(?=\s+["\'(]?[A-Z0-9])')
+
+
+def _json_complete(text: str) -> Optional[int]:
+    """Stop condition for streamed JSON: end index of the first complete object, if any"""
+    if '}' not in text:
+        return None
+    found = _find_json_object(text)
+    return found[1] if found is not None else None
+
+
+def _sentences_complete(count: int):
+    """Stop condition for streamed prose: end index of the `count`-th sentence, if written"""
+    def stop(text: str) -> Optional[int]:
+        for n, match in enumerate(_SENTENCE_END_RE.finditer(text), 1):
+            if n == count:
+                return match.end()
+        return None
+    return stop
+
+
+def _stop_condition(json_mode: bool, sentences: Optional[int]):
+    """Stop condition for a streamed response, or None to read it to the end"""
+    if json_mode:
+        return _json_complete
+    if sentences:
+        return _sentences_complete(sentences)
+    return None
+
+
+def _read_stream(stream, text_of, stop_when=None) -> str:
+    """
+    Concatenate the text of a streamed completion; text_of(chunk) extracts each
+    chunk's text. If `stop_when(text)` returns an index, the text is cut there
+    and the stream closed early, skipping tokens that would only be thrown away
+    (trailing text after a JSON object or extra sentences).
+    """
+    text = ''
+    try:
+        for chunk in stream:
+            text += text_of(chunk) or ''
+            end = stop_when(text) if stop_when is not None else None
+            if end is not None:
+                text = text[:end]
+                break
+    finally:
+        close = getattr(stream, 'close', None)
+        if close is not None:
+            close()
+    return text.strip()
+
+
+def _delta_text(chunk) -> Optional[str]:
+    """Text of a streamed chat completion chunk (OpenAI and Hugging Face)"""
+    choices = chunk.get('choices') if isinstance(chunk, dict) else getattr(chunk, 'choices', None)
+    if not choices:
+        return None
+    delta = choices[0].get('delta', {}) if isinstance(choices[0], dict) else choices[0].delta
+    return delta.get('content') if isinstance(delta, dict) else delta.content
+
+
+def _ollama_text(chunk) -> Optional[str]:
+    return chunk.get('response', '') if isinstance(chunk, dict) else getattr(chunk, 'response', '')
+
+
+@functools.lru_cache(maxsize=1)
+def _probe_ollama(time_bucket: int) -> bool:
+    """Whether the local Ollama server accepts connections (a TCP connect, no HTTP)"""
+    try:
+        with socket.create_connection(OLLAMA_ADDRESS, timeout=OLLAMA_PROBE_TIMEOUT):
+            return True
+    except OSError as e:
+        logger.debug(f"Ollama not reachable: {e}")
+        return False
+
+
+def _ollama_up() -> bool:
+    """_probe_ollama(), cached for PROVIDER_PROBE_TTL seconds"""
+    return _probe_ollama(int(time.time() // PROVIDER_PROBE_TTL))
+
+
+@functools.lru_cache(maxsize=1)
+def _llm_settings() -> Dict[str, Any]:
+    """
+    LLM configuration, read once per process. API keys from the environment
+    take precedence over Django settings.
+    """
+    configured = {}
+    if settings:
+        configured = {
+            name: getattr(settings, name, None)
+            for name in ('LLM_PROVIDER', 'OPENAI_API_KEY', 'HUGGINGFACE_API_KEY', 'LLM_REQUESTS_PER_MINUTE')
+        }
+    return {
+        'LLM_PROVIDER': configured.get('LLM_PROVIDER'),
+        'OPENAI_API_KEY': os.getenv('OPENAI_API_KEY') or configured.get('OPENAI_API_KEY'),
+        'HUGGINGFACE_API_KEY': os.getenv('HUGGINGFACE_API_KEY') or configured.get('HUGGINGFACE_API_KEY'),
+        'USE_OPENAI': os.getenv('USE_OPENAI', 'false').lower() == 'true',
+        'LLM_REQUESTS_PER_MINUTE': os.getenv('LLM_REQUESTS_PER_MINUTE') or configured.get('LLM_REQUESTS_PER_MINUTE'),
+    }
+
+
+def _parse_json_response(result_text: str) -> Any:
+    """
+    Parse the first JSON object out of an LLM response, ignoring any text the
+    model adds around it. Malformed JSON is repaired when json_repair is
+    installed. Raises ValueError if no valid JSON is found.
+    """
+    if ORJSON_AVAILABLE and result_text.lstrip().startswith('{'):
+        # JSON-mode responses are usually exactly one object
+        try:
+            return orjson.loads(result_text)
+        except orjson.JSONDecodeError:
+            pass
+    found = _find_json_object(result_text)
+    if found is not None:
+        return found[0]
+    try:
+        return json.loads(result_text, strict=False)
+    except ValueError:
+        if not JSON_REPAIR_AVAILABLE:
+            raise
+    import json_repair
+    repaired = json_repair.loads(result_text)
+    if not repaired:
+        raise ValueError("No JSON found in LLM response")
+    return repaired
+
+
+def _find_json_object(text: str) -> Optional[Tuple[Any, int]]:
+    """Return (object, end index) for the first decodable JSON object in text, or None"""
+    # raw_decode stops at the end of the first complete object, so trailing
+    # chatter is never scanned
+    start = text.find('{')
+    while start != -1:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)
+        except ValueError:
+            start = text.find('{', start + 1)
+    return None
+
+
+def _get_llm_cache():
+    """Return the persistent LLM cache, or None outside Django or when it isn't configured"""
+    if settings is None:
+        return None
+    try:
+        from django.core.cache import caches
+        return caches[LLM_CACHE_ALIAS]
+    except Exception:
+        return None
+
+
+def _cache_key(*parts: str) -> str:
+    return 'llm:' + hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _dumps_sorted(value: Any) -> str:
+    """Deterministic JSON for cache keys: sorted keys, anything unserializable as str()"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value, sort_keys=True, default=str)
+
+
+def _enhanced_description_key(engine, criterion_name, fw_data, framework, *args, **kwargs) -> str:
+    # Only what goes into the prompt; all_framework_data doesn't
+    return engine._enhanced_description_prompt(criterion_name, fw_data, framework)
+
+
+def _cached_response(key: str) -> Any:
+    """Look a response up in process memory, then in the persistent LLM cache"""
+    result = _response_memory.get(key)
+    if result is None:
+        cache = _get_llm_cache()
+        if cache is not None:
+            result = cache.get(key)
+            if result is not None:
+                _remember_response(key, result)
+    return result
+
+
+def _store_response(key: str, result: Any):
+    _remember_response(key, result)
+    cache = _get_llm_cache()
+    if cache is not None:
+        cache.set(key, result)
+
+
+def _remember_response(key: str, result: Any):
+    if len(_response_memory) >= RESPONSE_MEMORY_MAX_ENTRIES:
+        _response_memory.clear()
+    _response_memory[key] = result
+
+
+def cached_llm_result(name: str, temperature: Optional[float] = None, key=None):
+    """
+    Cache the non-empty result of an engine method, keyed by provider, model
+    and request. `name` identifies the cached operation, so sync and async
+    variants of the same call share entries.
+
+    `temperature` is the sampling temperature the method uses (a `temperature`
+    keyword argument overrides it); calls above CACHEABLE_MAX_TEMPERATURE are
+    not cached. `key(self, *args, **kwargs)` returns the text identifying the
+    request, usually its prompt; by default the call arguments are used.
+    """
+    def decorator(method):
+        def make_key(self, args, kwargs):
+            call_temperature = kwargs.get('temperature', temperature)
+            if self.provider == 'none' or (call_temperature is not None and call_temperature > CACHEABLE_MAX_TEMPERATURE):
+                return None
+            if key is not None:
+                request = key(self, *args, **kwargs)
+            else:
+                request = _dumps_sorted([args, kwargs])
+            return _cache_key(name, self.provider, self._model_name(), request)
+
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                cache_key = make_key(self, args, kwargs)
+                if cache_key is None:
+                    return await method(self, *args, **kwargs)
+                result = _cached_response(cache_key)
+                if result is None:
+                    result = await method(self, *args, **kwargs)
+                    if result:
+                        _store_response(cache_key, result)
+                return result
+            return async_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache_key = make_key(self, args, kwargs)
+            if cache_key is None:
+                return method(self, *args, **kwargs)
+            result = _cached_response(cache_key)
+            if result is None:
+                result = method(self, *args, **kwargs)
+                if result:
+                    _store_response(cache_key, result)
+            return result
+        return wrapper
+    return decorator
+
+
+class RateLimiter:
+    """
+    Token bucket allowing `requests_per_minute` requests, with bursts of up to
+    `burst`. Callers reserve a token and wait until it is due, so concurrent
+    requests are spaced out instead of being rejected by the provider. Safe to
+    share between threads and event loops.
+    """
+    
+    def __init__(self, requests_per_minute: float, burst: int = MAX_CONCURRENT_REQUESTS):
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, min(burst, int(requests_per_minute)))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+    
+    def wait(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+    
+    async def await_turn(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def _rate_limiter_for(provider: str) -> Optional[RateLimiter]:
+    """The request rate limiter for a provider, or None if it isn't rate limited"""
+    configured = _llm_settings()['LLM_REQUESTS_PER_MINUTE']
+    try:
+        requests_per_minute = float(configured) if configured else PROVIDER_REQUESTS_PER_MINUTE.get(provider)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid LLM_REQUESTS_PER_MINUTE: {configured!r}")
+        requests_per_minute = PROVIDER_REQUESTS_PER_MINUTE.get(provider)
+    return RateLimiter(requests_per_minute) if requests_per_minute else None
 
-try:
-    from sentence_transformers import SentenceTransformer
-    import numpy as np
-    from sklearn.metrics.pairwise import cosine_similarity
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+def _is_rate_limited(error: Exception) -> bool:
+    """Whether an API error is an HTTP 429 (openai, ollama and huggingface_hub errors)"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status == 429
 
 
 class LLMComparisonEngine:
     """Engine for LLM-enhanced criteria comparison"""
     
-    def __init__(self):
+    def __init__(self, description_skip_chars: Optional[int] = ENHANCED_DESCRIPTION_SKIP_CHARS):
+        """
+        description_skip_chars: descriptions at least this long that mention the
+        framework by name are considered good enough to skip enhancing them in
+        comparisons (see needs_enhanced_description); None always enhances.
+        """
+        self.description_skip_chars = description_skip_chars
+        # time.monotonic() when the detected provider turned out to be unusable
+        self.unavailable_since = None
         self.provider = self._detect_provider()
+        self.client = None
         self.model = None
         self.ollama_model = None
         self.hf_model = None
+        self.embedding_backend = 'torch'
+        # cache key -> float32 vector, shared by every call on this engine
+        self._embedding_store: Dict[str, Any] = {}
+        # Hugging Face model -> 'chat' or 'text_generation', whichever it answers
+        self._hf_modes: Dict[str, str] = {}
         
         if self.provider == 'openai':
             self._init_openai()
@@ -66,17 +610,34 @@ class LLMComparisonEngine:
             self._init_huggingface()
         elif self.provider == 'sentence_transformers':
             self._init_sentence_transformers()
+        
+        # One health check up front instead of every call timing out on its own
+        if self.provider in ('openai', 'huggingface') and not self._provider_healthy():
+            logger.warning(f"{self.provider} API is unreachable, LLM enhancement disabled for now")
+            self.close()
+            self.provider = 'none'
+            self.unavailable_since = time.monotonic()
+        
+        # Text generation for the detected provider; embedding-only and
+        # unavailable providers answer every prompt with None
+        self._invoke = {
+            'openai': self._invoke_openai,
+            'ollama': self._invoke_ollama,
+            'huggingface': self._invoke_hf,
+        }.get(self.provider, lambda *args, **kwargs: None)
+        self._rate_limiter = _rate_limiter_for(self.provider)
     
     def _detect_provider(self) -> str:
         """Detect which LLM provider to use - PRIORITIZES FREE OPTIONS"""
         logger.info("=== Detecting LLM Provider ===")
         
+        config = _llm_settings()
+        
         # Check if provider is forced in settings
-        if settings:
-            forced_provider = getattr(settings, 'LLM_PROVIDER', None)
-            if forced_provider:
-                logger.info(f"Provider forced in settings: {forced_provider}")
-                return forced_provider
+        forced_provider = config['LLM_PROVIDER']
+        if forced_provider:
+            logger.info(f"Provider forced in settings: {forced_provider}")
+            return forced_provider
         
         # PRIORITY 1: Hugging Face Inference API (FREE tier available)
         # Works without API key, but better rate limits with free key
@@ -87,28 +648,11 @@ class LLMComparisonEngine:
         
         # PRIORITY 2: Ollama (FREE, Local, Best quality for free)
         if OLLAMA_AVAILABLE:
-            try:
-                logger.info("Checking Ollama availability...")
-                # Test if Ollama is actually running
-                if REQUESTS_AVAILABLE:
-                    try:
-                        requests.get('http://localhost:11434/api/tags', timeout=2)
-                        logger.info("Ollama is running, but Hugging Face is preferred")
-                        # Don't return here, continue to check Hugging Face first
-                    except:
-                        logger.debug("Ollama not reachable via HTTP")
-                        pass
-                # Try with ollama client directly
-                try:
-                    ollama.list()
-                    logger.info("Ollama is available, but Hugging Face is preferred")
-                    # Don't return here, continue to check Hugging Face first
-                except:
-                    logger.debug("Ollama client not working")
-                    pass
-            except Exception as e:
-                logger.debug(f"Ollama check failed: {e}")
-                pass
+            logger.info("Checking Ollama availability...")
+            # Test if Ollama is actually running (result cached for PROVIDER_PROBE_TTL)
+            if _ollama_up():
+                logger.info("Ollama is running, but Hugging Face is preferred")
+                # Don't return here, continue to check Hugging Face first
         
         # PRIORITY 3: Sentence Transformers (FREE, Always available if installed)
         if SENTENCE_TRANSFORMERS_AVAILABLE:
@@ -116,25 +660,83 @@ class LLMComparisonEngine:
             return 'sentence_transformers'
         
         # PRIORITY 4: OpenAI (PAID - only if explicitly configured and free options not available)
-        openai_key = os.getenv('OPENAI_API_KEY') or (getattr(settings, 'OPENAI_API_KEY', None) if settings else None)
-        if OPENAI_AVAILABLE and openai_key:
+        if OPENAI_AVAILABLE and config['OPENAI_API_KEY']:
             # Only use OpenAI if user explicitly wants it (not default)
-            use_openai = os.getenv('USE_OPENAI', 'false').lower() == 'true'
-            if use_openai:
+            if config['USE_OPENAI']:
                 logger.info("OpenAI explicitly enabled")
                 return 'openai'
         
         logger.warning("No LLM provider available")
         return 'none'
     
+    def _provider_healthy(self) -> bool:
+        """
+        Make one minimal request to the provider. Only connection failures,
+        timeouts and rejected credentials count as unhealthy; other API errors
+        mean the service is up.
+        """
+        try:
+            if self.provider == 'openai':
+                self.client.with_options(timeout=PROVIDER_HEALTH_TIMEOUT, max_retries=0).models.list()
+            elif self.provider == 'huggingface':
+                from huggingface_hub import HfApi
+                hf_token = _llm_settings()['HUGGINGFACE_API_KEY']
+                HfApi(token=hf_token or None).model_info(
+                    self.hf_model or 'meta-llama/Llama-3.2-3B-Instruct',
+                    timeout=PROVIDER_HEALTH_TIMEOUT
+                )
+            return True
+        except Exception as e:
+            status = getattr(e, 'status_code', None) or getattr(getattr(e, 'response', None), 'status_code', None)
+            if status is not None and status not in (401, 403):
+                return True
+            logger.warning(f"{self.provider} health check failed: {e}")
+            return False
+    
+    def close(self):
+        """Release the provider client's connection pool"""
+        client, self.client = self.client, None
+        if client is None:
+            return
+        # OpenAI and InferenceClient expose close(); ollama.Client wraps an httpx client
+        close = getattr(client, 'close', None) or getattr(getattr(client, '_client', None), 'close', None)
+        if close is not None:
+            try:
+                close()
+            except Exception as e:
+                logger.debug(f"Error closing {self.provider} client: {e}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _http_client_options(self, timeout: Optional[float] = LLM_REQUEST_TIMEOUT) -> Dict[str, Any]:
+        """
+        httpx client options: a bounded keep-alive pool and timeouts, plus HTTP/2
+        when h2 is installed. timeout=None turns the timeouts off.
+        """
+        import httpx
+        return {
+            'limits': httpx.Limits(**HTTP_POOL_LIMITS),
+            'timeout': httpx.Timeout(timeout, connect=LLM_CONNECT_TIMEOUT) if timeout is not None else None,
+            'http2': HTTP2_AVAILABLE,
+        }
+    
     def _init_openai(self):
         """Initialize OpenAI client"""
         if OPENAI_AVAILABLE:
             try:
-                api_key = os.getenv('OPENAI_API_KEY') or getattr(settings, 'OPENAI_API_KEY', None)
+                api_key = _llm_settings()['OPENAI_API_KEY']
                 if api_key:
+                    import openai
                     openai.api_key = api_key
-                    self.client = openai.OpenAI(api_key=api_key)
+                    import httpx
+                    self.client = openai.OpenAI(
+                        api_key=api_key,
+                        http_client=httpx.Client(**self._http_client_options())
+                    )
                 else:
                     logger.warning("OpenAI API key not found")
                     self.provider = 'none'
@@ -148,9 +750,12 @@ class LLMComparisonEngine:
         """Initialize Ollama client"""
         if OLLAMA_AVAILABLE:
             try:
+                import ollama
+                # One client (and connection pool) for the life of the engine
+                client = ollama.Client(**self._http_client_options(timeout=None))
                 # Test connection
-                models_response = ollama.list()
-                self.client = ollama
+                models_response = client.list()
+                self.client = client
                 
                 # Get available models - handle different response formats
                 available_models = []
@@ -198,7 +803,7 @@ class LLMComparisonEngine:
         if HUGGINGFACE_AVAILABLE:
             try:
                 logger.info("Initializing Hugging Face client...")
-                hf_token = os.getenv('HUGGINGFACE_API_KEY') or (getattr(settings, 'HUGGINGFACE_API_KEY', None) if settings else None)
+                hf_token = _llm_settings()['HUGGINGFACE_API_KEY']
                 
                 if hf_token:
                     logger.info("Hugging Face API key found")
@@ -219,9 +824,10 @@ class LLMComparisonEngine:
                 
                 # Initialize client (works without token, but better with free token)
                 logger.info("Creating InferenceClient...")
-                self.client = InferenceClient(token=hf_token) if hf_token else InferenceClient()
+                from huggingface_hub import InferenceClient
+                self.client = InferenceClient(token=hf_token or None, timeout=LLM_REQUEST_TIMEOUT)
                 
-                if not hasattr(self, 'client') or self.client is None:
+                if self.client is None:
                     raise ValueError("Hugging Face client not initialized")
                 
                 logger.info(f"Hugging Face initialized successfully with model: {self.hf_model}" + (" (with API key)" if hf_token else " (without API key - limited rate)"))
@@ -232,17 +838,120 @@ class LLMComparisonEngine:
                 self.hf_model = None
     
     def _init_sentence_transformers(self):
-        """Initialize sentence transformers model"""
+        """
+        Initialize sentence transformers model. Runs in fp16 on a GPU when one
+        is available; on CPU prefers the int8 ONNX Runtime export of the model
+        and falls back to the default PyTorch backend if onnxruntime isn't
+        installed or no export matches this CPU.
+        """
         if SENTENCE_TRANSFORMERS_AVAILABLE:
+            import platform
+            from sentence_transformers import SentenceTransformer
+            device = self._embedding_device()
+            if device:
+                try:
+                    self.model = SentenceTransformer(EMBEDDING_MODEL_NAME, device=device)
+                    if device == 'cuda':
+                        self.model.half()
+                    self.embedding_backend = f'torch-{device}-fp16' if device == 'cuda' else f'torch-{device}'
+                    logger.info(f"Sentence transformers model loaded on {device}")
+                    return
+                except Exception as e:
+                    logger.info(f"Could not load model on {device}, using CPU: {e}")
+            onnx_file = EMBEDDING_ONNX_FILES.get(platform.machine().lower())
+            if onnx_file:
+                try:
+                    self.model = SentenceTransformer(
+                        EMBEDDING_MODEL_NAME,
+                        backend='onnx',
+                        model_kwargs={'file_name': onnx_file}
+                    )
+                    self.embedding_backend = onnx_file
+                    logger.info(f"Sentence transformers model loaded (ONNX, {onnx_file})")
+                    return
+                except Exception as e:
+                    logger.info(f"ONNX backend unavailable, using PyTorch: {e}")
             try:
                 # Use a lightweight model for semantic similarity
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+                self.embedding_backend = 'torch'
                 logger.info("Sentence transformers model loaded")
             except Exception as e:
                 logger.warning(f"Failed to load sentence transformers: {e}")
                 self.provider = 'none'
                 self.model = None
     
+    def _embedding_device(self) -> Optional[str]:
+        """'cuda' or 'mps' if torch can use an accelerator, else None"""
+        try:
+            import torch
+            if torch.cuda.is_available():
+                return 'cuda'
+            if getattr(torch.backends, 'mps', None) is not None and torch.backends.mps.is_available():
+                return 'mps'
+        except Exception:
+            pass
+        return None
+    
+    def _ollama_generate(self, prompt: str, options: Dict[str, Any], stop_when=None, **kwargs) -> str:
+        """Stream a completion from Ollama and return its text, stopping early as in _read_stream()"""
+        stream = self.client.generate(
+            model=self.ollama_model,
+            prompt=prompt,
+            options=options,
+            stream=True,
+            **kwargs
+        )
+        return _read_stream(stream, _ollama_text, stop_when)
+    
+    def _model_name(self) -> str:
+        """Name of the model answering requests for the current provider"""
+        return {
+            'openai': 'gpt-4o-mini',
+            'ollama': self.ollama_model,
+            'huggingface': self.hf_model,
+            'sentence_transformers': EMBEDDING_MODEL_NAME,
+        }.get(self.provider) or ''
+    
+    def _encode(self, texts: List[str]):
+        """
+        Encode texts into unit-length float32 vectors with the sentence
+        transformer. Vectors are looked up in the in-process embedding store,
+        then the persistent LLM cache, so only texts that haven't been seen
+        before are run through the model.
+        """
+        import numpy as np
+        
+        keys = [_cache_key('embedding', EMBEDDING_MODEL_NAME, self.embedding_backend, 'normalized', text) for text in texts]
+        vectors = {key: self._embedding_store[key] for key in keys if key in self._embedding_store}
+        
+        cache = _get_llm_cache()
+        if cache is not None and len(vectors) < len(keys):
+            vectors.update(cache.get_many([key for key in keys if key not in vectors]))
+        
+        missing = [i for i, key in enumerate(keys) if key not in vectors]
+        if missing:
+            encoded = self.model.encode(
+                [texts[i] for i in missing],
+                batch_size=64, convert_to_numpy=True, normalize_embeddings=True
+            )
+            new_vectors = {keys[i]: encoded[n] for n, i in enumerate(missing)}
+            if cache is not None:
+                cache.set_many(new_vectors)
+            vectors.update(new_vectors)
+        
+        if len(self._embedding_store) + len(vectors) > EMBEDDING_STORE_MAX_ENTRIES:
+            self._embedding_store.clear()
+        for key, vector in vectors.items():
+            self._embedding_store[key] = np.asarray(vector, dtype=np.float32)
+        return np.stack([self._embedding_store[key] for key in keys])
+    
+    def _embedding_text(self, criterion: Dict[str, Any]) -> str:
+        """Combine name and (clipped) description for better semantic understanding"""
+        name = criterion.get('name', '')
+        desc = (criterion.get('description') or '')[:EMBEDDING_DESCRIPTION_CHARS]
+        return f"{name}. {desc}" if desc else name
+    
     def find_semantic_similarities(self, criteria_list: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """
         Find criteria that are semantically similar even if named differently.
@@ -270,210 +979,72 @@ class LLMComparisonEngine:
             return {}
         
         try:
-            # Create embeddings for all criteria names and descriptions
-            texts = []
-            criterion_map = {}
-            
-            for criterion in criteria_list:
-                name = criterion.get('name', '')
-                desc = criterion.get('description', '') or ''
-                # Combine name and description for better semantic understanding
-                text = f"{name}. {desc}" if desc else name
-                texts.append(text)
-                criterion_map[len(texts) - 1] = name
+            texts = [self._embedding_text(c) for c in criteria_list]
             
             if not texts:
                 return {}
             
             # Generate embeddings
-            embeddings = self.model.encode(texts)
+            embeddings = self._encode(texts)
             
-            # Calculate similarity matrix
-            similarity_matrix = cosine_similarity(embeddings)
+            # Top-k search per criterion; avoids materializing the full N x N matrix.
+            # top_k includes the criterion itself, which is dropped below.
+            # Embeddings are normalized, so the dot product is the cosine similarity.
+            from sentence_transformers import util
+            hits = util.semantic_search(embeddings, embeddings, top_k=4, score_function=util.dot_score)
         except Exception as e:
             logger.error(f"Error in embeddings calculation: {e}")
             return {}
         
-        # Find similar criteria (threshold: 0.7)
+        # Find similar criteria (threshold: 0.7), top 3 per criterion
         similarities = {}
         threshold = 0.7
         
-        for i, criterion in enumerate(criteria_list):
-            name = criterion.get('name', '')
-            similar = []
-            
-            for j, other_criterion in enumerate(criteria_list):
-                if i != j:
-                    similarity_score = similarity_matrix[i][j]
-                    if similarity_score >= threshold:
-                        similar.append({
-                            'name': other_criterion.get('name', ''),
-                            'similarity': float(similarity_score)
-                        })
-            
+        for i, criterion_hits in enumerate(hits):
+            similar = [
+                criteria_list[hit['corpus_id']].get('name', '')
+                for hit in criterion_hits
+                if hit['corpus_id'] != i and hit['score'] >= threshold
+            ]
             if similar:
-                # Sort by similarity score
-                similar.sort(key=lambda x: x['similarity'], reverse=True)
-                similarities[name] = [s['name'] for s in similar[:3]]  # Top 3 most similar
+                similarities[criteria_list[i].get('name', '')] = similar[:3]
         
         return similarities
     
+    @cached_llm_result('_find_similarities_llm', temperature=0.3)
     def _find_similarities_llm(self, criteria_list: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """Find similarities using LLM"""
         if len(criteria_list) < 2:
             return {}
         
-        # Prepare criteria data for LLM
-        criteria_text = "\n".join([
-            f"- {c.get('name', '')}: {c.get('description', '')[:100]}"
-            for c in criteria_list[:20]  # Limit to avoid token limits
-        ])
+        prompt = self._similarities_prompt(criteria_list)
+        result_text = self._invoke(
+            prompt, 1000, 0.3,
+            system="You are an expert in knowledge graph quality frameworks. Analyze criteria and identify semantic similarities.",
+            json_mode=True,
+            json_schema=NAME_LISTS_SCHEMA
+        )
+        if not result_text:
+            return {}
         
-        prompt = f"""Analyze these knowledge graph quality criteria and identify which ones are semantically similar or conceptually related, even if they have different names.
-
-Criteria:
-{criteria_text}
-
-Return a JSON object where keys are criterion names and values are lists of similar criterion names. Only include criteria that are genuinely similar (same concept, different wording). Format:
-{{"Criterion Name": ["Similar Criterion 1", "Similar Criterion 2"]}}
-
-Return only valid JSON, no other text."""
-
         try:
-            if self.provider == 'openai':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("OpenAI client not initialized")
-                    return {}
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4o-mini",  # Using mini for cost efficiency
-                        messages=[
-                            {"role": "system", "content": "You are an expert in knowledge graph quality frameworks. Analyze criteria and identify semantic similarities."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=1000
-                    )
-                    result_text = response.choices[0].message.content.strip()
-                except Exception as e:
-                    logger.error(f"OpenAI API error: {e}")
-                    return {}
-            elif self.provider == 'ollama':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("Ollama client not initialized")
-                    return {}
-                model = getattr(self, 'ollama_model', 'llama3.2')
-                if not model:
-                    logger.error("Ollama model not set")
-                    return {}
-                try:
-                    response = self.client.generate(
-                        model=model,
-                        prompt=prompt,
-                        options={'temperature': 0.3}
-                    )
-                    # Handle different response formats
-                    if isinstance(response, dict):
-                        result_text = response.get('response', '').strip()
-                    elif hasattr(response, 'response'):
-                        result_text = response.response.strip()
-                    else:
-                        result_text = str(response).strip()
-                except Exception as e:
-                    logger.error(f"Ollama API error: {e}")
-                    return {}
-            elif self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("Hugging Face client not initialized")
-                    return {}
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                logger.info(f"Calling Hugging Face API with model: {model}")
-                logger.debug(f"Prompt length: {len(prompt)} characters")
-                try:
-                    import time
-                    api_start = time.time()
-                    # Try chat completion API first (more reliable)
-                    try:
-                        logger.debug("Trying chat completion API...")
-                        messages = [{"role": "user", "content": prompt}]
-                        response = self.client.chat_completion(
-                            model=model,
-                            messages=messages,
-                            max_tokens=500,
-                            temperature=0.3
-                        )
-                        # Extract text from chat completion response
-                        if hasattr(response, 'choices') and len(response.choices) > 0:
-                            result_text = response.choices[0].message.content.strip()
-                        elif isinstance(response, dict) and 'choices' in response:
-                            result_text = response['choices'][0]['message']['content'].strip()
-                        else:
-                            result_text = str(response).strip()
-                        api_time = time.time() - api_start
-                        logger.info(f"Hugging Face chat API call completed in {api_time:.2f}s")
-                    except Exception as chat_error:
-                        logger.debug(f"Chat API failed: {chat_error}, trying text generation...")
-                        # Fallback to text generation
-                        try:
-                            response = self.client.text_generation(
-                                prompt,
-                                model=model,
-                                max_new_tokens=500,
-                                temperature=0.3,
-                                do_sample=True
-                            )
-                            result_text = response.strip() if isinstance(response, str) else str(response).strip()
-                            api_time = time.time() - api_start
-                            logger.info(f"Hugging Face text generation completed in {api_time:.2f}s")
-                        except Exception as text_error:
-                            logger.warning(f"Text generation also failed: {text_error}")
-                            raise text_error
-                except Exception as e:
-                    logger.error(f"Hugging Face API error with {model}: {e}", exc_info=True)
-                    # Try fallback model if main model fails
-                    try:
-                        logger.info("Trying fallback model: google/flan-t5-large")
-                        response = self.client.text_generation(
-                            prompt,
-                            model='google/flan-t5-large',
-                            max_new_tokens=500,
-                            temperature=0.3
-                        )
-                        result_text = response.strip() if isinstance(response, str) else str(response).strip()
-                        logger.info("Fallback model succeeded")
-                    except Exception as e2:
-                        logger.error(f"Hugging Face fallback also failed: {e2}", exc_info=True)
-                        return {}
-            else:
-                return {}
-            
-            # Parse JSON response
-            # Try to extract JSON from response (in case LLM adds extra text)
-            import re
-            json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-            if json_match:
-                result_text = json_match.group(0)
-            
-            similarities = json.loads(result_text)
-            return similarities
-            
+            # Parse JSON response (the LLM may add extra text around it)
+            return _parse_json_response(result_text)
         except Exception as e:
             logger.error(f"Error in LLM similarity detection: {e}")
             return {}
     
-    def generate_comparison_summary(self, criterion_name: str, framework_data: List[Dict[str, Any]]) -> Optional[str]:
+    def _comparison_definitions_text(self, framework_data: List[Dict[str, Any]]) -> Optional[str]:
         """
-        Generate an intelligent summary comparing how different frameworks define a criterion.
+        Format the descriptions/definitions of a criterion across frameworks for a
+        comparison prompt. Returns None when fewer than 2 frameworks have any.
         """
-        if self.provider == 'none':
-            return None
-        
         # Collect all definitions and descriptions
         definitions = []
         for i, fw_data in enumerate(framework_data):
             if fw_data.get('has_criterion'):
-                desc = fw_data.get('description', '')
-                defs = fw_data.get('definitions', [])
+                desc = _clip(fw_data.get('description', ''), PROMPT_DESCRIPTION_CHARS)
+                defs = _clip_definitions(fw_data.get('definitions', []))
                 if desc or defs:
                     definitions.append({
                         'framework_index': i,
@@ -482,138 +1053,497 @@ Return only valid JSON, no other text."""
                     })
         
         if len(definitions) < 2:
-            return None  # Need at least 2 frameworks to compare
+            return None
         
-        # Build prompt
-        definitions_text = "\n\n".join([
+        return "\n\n".join([
             f"Framework {i+1}:\nDescription: {d['description']}\nDefinitions: {'; '.join(d['definitions'])}"
             for i, d in enumerate(definitions)
         ])
+    
+    def _invoke_openai(self, prompt: str, max_tokens: int, temperature: float,
+                       system: Optional[str] = None, json_mode: bool = False,
+                       json_schema: Optional[Dict[str, Any]] = None,
+                       sentences: Optional[int] = None) -> Optional[str]:
+        if self.client is None:
+            logger.error("OpenAI client not initialized")
+            return None
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        kwargs = {'response_format': {"type": "json_object"}} if json_mode else {}
+        stop_when = _stop_condition(json_mode, sentences)
+        try:
+            response = self.client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=stop_when is not None,
+                **kwargs
+            )
+            if stop_when is not None:
+                return _read_stream(response, _delta_text, stop_when)
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            logger.error(f"OpenAI API error: {e}")
+            return None
+    
+    def _invoke_ollama(self, prompt: str, max_tokens: int, temperature: float,
+                       system: Optional[str] = None, json_mode: bool = False,
+                       json_schema: Optional[Dict[str, Any]] = None,
+                       sentences: Optional[int] = None) -> Optional[str]:
+        if self.client is None:
+            logger.error("Ollama client not initialized")
+            return None
+        if not self.ollama_model:
+            logger.error("Ollama model not set")
+            return None
+        kwargs = {'format': 'json'} if json_mode else {}
+        try:
+            return self._ollama_generate(
+                prompt,
+                options={'temperature': temperature, 'num_predict': max_tokens},
+                stop_when=_stop_condition(json_mode, sentences),
+                **kwargs
+            )
+        except Exception as e:
+            logger.error(f"Ollama API error: {e}")
+            return None
+    
+    def _hf_mode(self, model: str) -> Optional[str]:
+        """The call path known to work for a Hugging Face model, or None if not yet known"""
+        mode = self._hf_modes.get(model)
+        if mode is None:
+            cache = _get_llm_cache()
+            if cache is not None:
+                mode = cache.get(_cache_key('hf_mode', model))
+                if mode is not None:
+                    self._hf_modes[model] = mode
+        return mode
+    
+    def _remember_hf_mode(self, model: str, mode: str):
+        logger.info(f"Hugging Face model {model} answers via {mode}")
+        self._hf_modes[model] = mode
+        cache = _get_llm_cache()
+        if cache is not None:
+            cache.set(_cache_key('hf_mode', model), mode, HF_CAPABILITY_TTL)
+    
+    def _invoke_hf(self, prompt: str, max_tokens: int, temperature: float,
+                   system: Optional[str] = None, json_mode: bool = False,
+                   json_schema: Optional[Dict[str, Any]] = None,
+                   sentences: Optional[int] = None) -> Optional[str]:
+        if self.client is None:
+            logger.error("Hugging Face client not initialized")
+            return None
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+        model = self.hf_model or 'meta-llama/Llama-3.2-3B-Instruct'
+        constrained = json_mode and json_schema
+        stop_when = _stop_condition(json_mode, sentences)
+        mode = self._hf_mode(model)
+        # Models known not to serve chat completion go straight to text generation
+        if mode != 'text_generation':
+            try:
+                # Chat completion applies the model's own chat template
+                kwargs = {'response_format': {"type": "json", "value": json_schema}} if constrained else {}
+                response = self.client.chat_completion(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=stop_when is not None,
+                    **kwargs
+                )
+                if stop_when is not None:
+                    result = _read_stream(response, _delta_text, stop_when)
+                elif hasattr(response, 'choices') and len(response.choices) > 0:
+                    result = response.choices[0].message.content.strip()
+                elif isinstance(response, dict) and 'choices' in response:
+                    result = response['choices'][0]['message']['content'].strip()
+                else:
+                    result = str(response).strip()
+                if mode is None:
+                    self._remember_hf_mode(model, 'chat')
+                return result
+            except Exception as chat_error:
+                logger.debug(f"Chat API failed: {chat_error}, trying text generation...")
         
-        prompt = f"""Compare how different knowledge graph quality frameworks define the criterion "{criterion_name}".
-
-Definitions:
-{definitions_text}
-
-Provide a concise 2-3 sentence summary highlighting:
-1. Key similarities in how frameworks define this criterion
-2. Notable differences or unique perspectives
-3. Any important nuances
-
-Be specific and factual. Return only the summary text, no markdown formatting."""
-
         try:
-            if self.provider == 'openai':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("OpenAI client not initialized")
-                    return None
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are an expert in knowledge graph quality frameworks. Provide concise, factual comparisons."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.4,
-                        max_tokens=200
-                    )
-                    summary = response.choices[0].message.content.strip()
-                except Exception as e:
-                    logger.error(f"OpenAI API error: {e}")
-                    return None
-            elif self.provider == 'ollama':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("Ollama client not initialized")
-                    return None
-                model = getattr(self, 'ollama_model', 'llama3.2')
-                if not model:
-                    logger.error("Ollama model not set")
+            kwargs = {'grammar': {"type": "json", "value": json_schema}} if constrained else {}
+            response = self.client.text_generation(
+                prompt,
+                model=model,
+                max_new_tokens=max_tokens,
+                temperature=temperature,
+                do_sample=True,
+                stream=stop_when is not None,
+                **kwargs
+            )
+            if stop_when is not None:
+                # Streamed text generation yields the token texts
+                result = _read_stream(response, str, stop_when)
+            else:
+                result = response.strip() if isinstance(response, str) else str(response).strip()
+            if mode is None:
+                # Chat completion failed where text generation works
+                self._remember_hf_mode(model, 'text_generation')
+            return result
+        except Exception as e:
+            logger.error(f"Hugging Face API error with {model}: {e}")
+        
+        # Try fallback model if main model fails
+        try:
+            logger.info("Trying fallback model: google/flan-t5-large")
+            response = self.client.text_generation(
+                prompt,
+                model='google/flan-t5-large',
+                max_new_tokens=max_tokens,
+                temperature=temperature
+            )
+            return response.strip() if isinstance(response, str) else str(response).strip()
+        except Exception as e:
+            logger.error(f"Hugging Face fallback also failed: {e}")
+            return None
+    
+    @cached_llm_result('_complete')
+    def _complete(self, prompt: str, max_tokens: int, temperature: float,
+                  system: Optional[str] = None, json_mode: bool = False,
+                  json_schema: Optional[Dict[str, Any]] = None,
+                  sentences: Optional[int] = None) -> Optional[str]:
+        """
+        Send a single prompt to the configured provider and return the response text.
+        Returns None if the provider is unavailable or the call fails.
+        With json_mode the provider's JSON output mode is used; Hugging Face
+        endpoints additionally need json_schema to constrain the output.
+        `sentences` lets streaming providers stop once that many sentences are done.
+        """
+        return self._invoke(prompt, max_tokens, temperature, system=system,
+                            json_mode=json_mode, json_schema=json_schema, sentences=sentences)
+    
+    def generate_comparison_summaries(self, items: List[Tuple[str, List[Dict[str, Any]]]]) -> Dict[str, str]:
+        """
+        Generate comparison summaries for several criteria with a single LLM call.
+        items is a list of (criterion_name, framework_data) pairs; returns a dict
+        mapping criterion names to summaries. Criteria the model leaves out of its
+        response are simply missing from the result.
+        """
+        if self.provider == 'none' or not items:
+            return {}
+        
+        blocks = []
+        for criterion_name, framework_data in items:
+            definitions_text = self._comparison_definitions_text(framework_data)
+            if definitions_text:
+                blocks.append(f'Criterion "{criterion_name}":\n{definitions_text}')
+        
+        if not blocks:
+            return {}
+        
+        criteria_text = "\n\n---\n\n".join(blocks)
+        prompt = COMPARISON_SUMMARIES_PROMPT.format(criteria_text=criteria_text)
+        
+        return self._complete_text_map(
+            prompt,
+            max_tokens=200 * len(blocks),
+            temperature=0.4,
+            system="You are an expert in knowledge graph quality frameworks. Provide concise, factual comparisons."
+        )
+    
+    def _complete_text_map(self, prompt: str, max_tokens: int, temperature: float,
+                           system: Optional[str] = None) -> Dict[str, str]:
+        """
+        Run a batched prompt whose answer is a JSON object of criterion name ->
+        text, returning the non-empty entries ({} if the call or parsing fails).
+        """
+        result_text = self._complete(
+            prompt,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system,
+            json_mode=True,
+            json_schema=SUMMARIES_SCHEMA
+        )
+        if not result_text:
+            return {}
+        
+        try:
+            texts = _parse_json_response(result_text)
+        except ValueError as e:
+            logger.warning(f"Could not parse batched response: {e}")
+            return {}
+        
+        if not isinstance(texts, dict):
+            return {}
+        return {name: str(text).strip() for name, text in texts.items() if text}
+    
+    def _similarities_prompt(self, criteria_list: List[Dict[str, Any]]) -> str:
+        """Build the prompt asking the LLM for semantically similar criteria"""
+        # Prepare criteria data for LLM
+        criteria_text = "\n".join([
+            f"- {c.get('name', '')}: {_clip(c.get('description', ''), 100)}"
+            for c in criteria_list[:20]  # Limit to avoid token limits
+        ])
+        
+        return SIMILARITIES_PROMPT.format(criteria_text=criteria_text)
+    
+    def _comparison_summary_prompt(self, criterion_name: str, definitions_text: str) -> str:
+        """Build the prompt for a single-criterion comparison summary"""
+        return COMPARISON_SUMMARY_PROMPT.format(
+            criterion_name=criterion_name,
+            definitions_text=definitions_text
+        )
+    
+    def _make_async_client(self):
+        """
+        Create an async client for the current provider, or None if the provider
+        has no async client available. Async clients are bound to the event loop
+        they are used in, so a new one is made for every asyncio.run().
+        """
+        try:
+            if self.provider == 'openai' and OPENAI_AVAILABLE:
+                import openai
+                api_key = _llm_settings()['OPENAI_API_KEY']
+                if not api_key:
                     return None
+                import httpx
+                return openai.AsyncOpenAI(
+                    api_key=api_key,
+                    http_client=httpx.AsyncClient(**self._http_client_options())
+                )
+            elif self.provider == 'ollama' and OLLAMA_AVAILABLE:
+                import ollama
+                # Extra keyword arguments are passed through to the underlying httpx.AsyncClient
+                return ollama.AsyncClient(**self._http_client_options(timeout=None))
+            elif self.provider == 'huggingface' and HUGGINGFACE_AVAILABLE:
+                from huggingface_hub import AsyncInferenceClient
+                hf_token = _llm_settings()['HUGGINGFACE_API_KEY']
+                return AsyncInferenceClient(token=hf_token or None, timeout=LLM_REQUEST_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Could not create async {self.provider} client: {e}")
+        return None
+    
+    async def _acall_llm(self, prompt: str, max_tokens: int, temperature: float = 0.4,
+                         system: Optional[str] = None) -> Optional[str]:
+        """
+        Async counterpart of _complete(), using the async client of the current
+        session (see _agather). Returns None outside a session.
+        """
+        session = _async_session.get()
+        if session is None:
+            return None
+        aclient, semaphore = session
+        
+        async with semaphore:
+            for attempt in range(RATE_LIMIT_RETRIES + 1):
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.await_turn()
                 try:
-                    response = self.client.generate(
-                        model=model,
-                        prompt=prompt,
-                        options={'temperature': 0.4, 'num_predict': 200}
-                    )
-                    # Handle different response formats
-                    if isinstance(response, dict):
-                        summary = response.get('response', '').strip()
-                    elif hasattr(response, 'response'):
-                        summary = response.response.strip()
-                    else:
-                        summary = str(response).strip()
+                    return await self._acall_provider(aclient, prompt, max_tokens, temperature, system)
                 except Exception as e:
-                    logger.error(f"Ollama API error: {e}")
+                    if _is_rate_limited(e) and attempt < RATE_LIMIT_RETRIES:
+                        delay = RATE_LIMIT_BACKOFF * 2 ** attempt
+                        logger.debug(f"{self.provider} rate limited, retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    logger.error(f"{self.provider} async API error: {e}")
                     return None
-            elif self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("Hugging Face client not initialized")
-                    return None
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                try:
-                    # Hugging Face InferenceClient API: model is passed to text_generation
-                    # Try with instruction format first (for Phi-3 and similar models)
-                    try:
-                        formatted_prompt = f"<|user|>\n{prompt}<|end|>\n<|assistant|>\n"
-                        response = self.client.text_generation(
-                            formatted_prompt,
-                            model=model,
-                            max_new_tokens=200,
-                            temperature=0.4,
-                            do_sample=True
-                        )
-                        summary = response.strip() if isinstance(response, str) else str(response).strip()
-                    except Exception as format_error:
-                        # Fallback to simple prompt format
-                        logger.debug(f"Instruction format failed, trying simple format: {format_error}")
-                        response = self.client.text_generation(
-                            prompt,
-                            model=model,
-                            max_new_tokens=200,
-                            temperature=0.4,
-                            do_sample=True
-                        )
-                        summary = response.strip() if isinstance(response, str) else str(response).strip()
-                except Exception as e:
-                    logger.error(f"Hugging Face API error with {model}: {e}")
-                    # Try fallback model if main model fails
-                    try:
-                        logger.info("Trying fallback model: google/flan-t5-large")
-                        response = self.client.text_generation(
-                            prompt,
-                            model='google/flan-t5-large',
-                            max_new_tokens=200,
-                            temperature=0.4
-                        )
-                        summary = response.strip() if isinstance(response, str) else str(response).strip()
-                    except Exception as e2:
-                        logger.error(f"Hugging Face fallback also failed: {e2}")
-                        return None
-            else:
+        return None
+    
+    async def _acall_provider(self, aclient, prompt: str, max_tokens: int, temperature: float,
+                              system: Optional[str] = None) -> Optional[str]:
+        """Make one request with the async client; API errors propagate"""
+        if self.provider == 'openai':
+            messages = [{"role": "system", "content": system}] if system else []
+            messages.append({"role": "user", "content": prompt})
+            response = await aclient.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            return response.choices[0].message.content.strip()
+        elif self.provider == 'ollama':
+            model = self.ollama_model
+            if not model:
+                logger.error("Ollama model not set")
                 return None
-            
-            return summary
-            
+            response = await aclient.generate(
+                model=model,
+                prompt=prompt,
+                options={'temperature': temperature, 'num_predict': max_tokens}
+            )
+            if isinstance(response, dict):
+                return response.get('response', '').strip()
+            elif hasattr(response, 'response'):
+                return response.response.strip()
+            return str(response).strip()
+        elif self.provider == 'huggingface':
+            return await self._acall_hf(aclient, prompt, max_tokens, temperature)
+        return None
+    
+    async def _acall_hf(self, aclient, prompt: str, max_tokens: int, temperature: float) -> Optional[str]:
+        """
+        Async counterpart of _invoke_hf(): chat completion, then text generation,
+        then the fallback model. Rate limit errors propagate so _acall_llm can
+        retry; the fallback model's error propagates as the final failure.
+        """
+        model = self.hf_model or 'meta-llama/Llama-3.2-3B-Instruct'
+        mode = self._hf_mode(model)
+        # Models known not to serve chat completion go straight to text generation
+        if mode != 'text_generation':
+            try:
+                response = await aclient.chat_completion(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=temperature
+                )
+                if hasattr(response, 'choices') and len(response.choices) > 0:
+                    result = response.choices[0].message.content.strip()
+                elif isinstance(response, dict) and 'choices' in response:
+                    result = response['choices'][0]['message']['content'].strip()
+                else:
+                    result = str(response).strip()
+                if mode is None:
+                    self._remember_hf_mode(model, 'chat')
+                return result
+            except Exception as chat_error:
+                if _is_rate_limited(chat_error):
+                    raise
+                logger.debug(f"Chat API failed: {chat_error}, trying text generation...")
+        
+        try:
+            response = await aclient.text_generation(
+                prompt,
+                model=model,
+                max_new_tokens=max_tokens,
+                temperature=temperature,
+                do_sample=True
+            )
+            if mode is None:
+                # Chat completion failed where text generation works
+                self._remember_hf_mode(model, 'text_generation')
+            return response.strip() if isinstance(response, str) else str(response).strip()
         except Exception as e:
-            logger.error(f"Error generating comparison summary: {e}")
+            if _is_rate_limited(e):
+                raise
+            logger.error(f"Hugging Face API error with {model}: {e}")
+        
+        # Try fallback model if main model fails
+        logger.info("Trying fallback model: google/flan-t5-large")
+        response = await aclient.text_generation(
+            prompt,
+            model='google/flan-t5-large',
+            max_new_tokens=max_tokens,
+            temperature=temperature
+        )
+        return response.strip() if isinstance(response, str) else str(response).strip()
+    
+    @cached_llm_result('generate_comparison_summary', temperature=0.4)
+    async def agenerate_comparison_summary(self, criterion_name: str, framework_data: List[Dict[str, Any]]) -> Optional[str]:
+        """Async variant of generate_comparison_summary()"""
+        if self.provider == 'none':
+            return None
+        
+        definitions_text = self._comparison_definitions_text(framework_data)
+        if not definitions_text:
+            return None
+        
+        return await self._acall_llm(
+            self._comparison_summary_prompt(criterion_name, definitions_text),
+            max_tokens=200,
+            temperature=0.4,
+            system="You are an expert in knowledge graph quality frameworks. Provide concise, factual comparisons."
+        )
+    
+    async def _agather(self, make_calls, aclient) -> List[Any]:
+        """Await the coroutines returned by make_calls() together, using the given async client"""
+        token = _async_session.set((aclient, asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)))
+        try:
+            return await asyncio.gather(*make_calls(), return_exceptions=True)
+        finally:
+            _async_session.reset(token)
+            close = getattr(aclient, 'close', None)
+            if close is not None:
+                try:
+                    result = close()
+                    if asyncio.iscoroutine(result):
+                        await result
+                except Exception:
+                    pass
+    
+    def _run_concurrently(self, make_calls) -> Optional[List[Any]]:
+        """
+        Run the coroutines returned by make_calls() concurrently and return their
+        results (exceptions included, in order). Returns None when the provider
+        has no async client or an event loop is already running, in which case
+        callers fall back to the sync methods.
+        """
+        if self.provider not in ('openai', 'ollama', 'huggingface'):
+            return None
+        try:
+            asyncio.get_running_loop()
             return None
+        except RuntimeError:
+            # No running loop in this thread, so asyncio.run() is safe
+            pass
+        aclient = self._make_async_client()
+        if aclient is None:
+            return None
+        return asyncio.run(self._agather(make_calls, aclient))
     
-    def generate_criterion_insights(self, criterion_name: str, framework_data: List[Dict[str, Any]], 
-                                    selected_frameworks: List) -> Optional[str]:
+    def generate_comparison_summaries_concurrently(self, items: List[Tuple[str, List[Dict[str, Any]]]]) -> Dict[str, str]:
         """
-        Generate detailed insights about how different frameworks handle a criterion.
+        Generate one comparison summary per (criterion_name, framework_data) pair,
+        sending the requests concurrently. Falls back to sequential calls if the
+        provider has no async client or an event loop is already running.
+        """
+        if self.provider == 'none' or not items:
+            return {}
+        
+        results = self._run_concurrently(lambda: [self.agenerate_comparison_summary(c, d) for c, d in items])
+        if results is None:
+            results = [self.generate_comparison_summary(c, d) for c, d in items]
+        
+        summaries = {}
+        for (criterion_name, _), summary in zip(items, results):
+            if isinstance(summary, Exception):
+                logger.warning(f"Error generating summary for {criterion_name}: {summary}")
+            elif summary:
+                summaries[criterion_name] = summary
+        return summaries
+    
+    @cached_llm_result('generate_comparison_summary', temperature=0.4)
+    def generate_comparison_summary(self, criterion_name: str, framework_data: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Generate an intelligent summary comparing how different frameworks define a criterion.
         """
         if self.provider == 'none':
             return None
         
+        definitions_text = self._comparison_definitions_text(framework_data)
+        if not definitions_text:
+            return None  # Need at least 2 frameworks to compare
+        
+        prompt = self._comparison_summary_prompt(criterion_name, definitions_text)
+        # The prompt asks for 2-3 sentences
+        return self._invoke(
+            prompt, 200, 0.4,
+            system="You are an expert in knowledge graph quality frameworks. Provide concise, factual comparisons.",
+            sentences=3
+        )
+    
+    def _framework_approaches(self, framework_data: List[Dict[str, Any]], selected_frameworks: List) -> List[str]:
+        """One line per framework that has the criterion, with its category, description and definitions"""
         # Collect all definitions and descriptions
         framework_info = []
         for i, fw_data in enumerate(framework_data):
             if fw_data.get('has_criterion'):
                 framework_name = selected_frameworks[i].name if i < len(selected_frameworks) else f"Framework {i+1}"
-                desc = fw_data.get('description', '')
-                defs = fw_data.get('definitions', [])
-                category = fw_data.get('category', '')
+                desc = _clip(fw_data.get('description', ''), PROMPT_DESCRIPTION_CHARS)
+                defs = _clip_definitions(fw_data.get('definitions', []))
+                category = _clip(fw_data.get('category', ''), PROMPT_CATEGORY_CHARS)
                 
                 info_text = f"{framework_name}:"
                 if category:
@@ -624,65 +1554,60 @@ Be specific and factual. Return only the summary text, no markdown formatting.""
                     info_text += f" Definitions: {'; '.join(defs[:2])}"
                 
                 framework_info.append(info_text)
+        return framework_info
+    
+    def generate_criterion_insights_batch(self, items: List[Tuple[str, List[Dict[str, Any]]]],
+                                          selected_frameworks: List) -> Dict[str, str]:
+        """
+        Generate insights for several multi-framework criteria with a single LLM
+        call. items is a list of (criterion_name, framework_data) pairs; returns a
+        dict mapping criterion names to insights.
+        """
+        # Insights are only generated with Hugging Face, as in generate_criterion_insights()
+        if self.provider != 'huggingface' or not items:
+            return {}
         
-        if len(framework_info) < 2:
-            return None
-        
-        prompt = f"""Analyze how different knowledge graph quality frameworks approach the criterion "{criterion_name}".
-
-Framework approaches:
-{chr(10).join(f'- {info}' for info in framework_info)}
-
-Provide 2-3 sentences highlighting:
-1. Key differences in how frameworks implement or measure this criterion
-2. Which framework has the most comprehensive approach
-3. Any practical implications or recommendations
-
-Be concise and actionable. Return only the insight text, no markdown."""
+        blocks = []
+        for criterion_name, framework_data in items:
+            framework_info = self._framework_approaches(framework_data, selected_frameworks)
+            if len(framework_info) >= 2:
+                blocks.append(f'Criterion "{criterion_name}":\n' + '\n'.join(f'- {info}' for info in framework_info))
+        if not blocks:
+            return {}
         
-        try:
-            if self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    return None
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                try:
-                    formatted_prompt = f"<|user|>\n{prompt}<|end|>\n<|assistant|>\n"
-                    response = self.client.text_generation(
-                        formatted_prompt,
-                        model=model,
-                        max_new_tokens=150,
-                        temperature=0.5,
-                        do_sample=True
-                    )
-                    return response.strip() if isinstance(response, str) else str(response).strip()
-                except:
-                    response = self.client.text_generation(
-                        prompt,
-                        model=model,
-                        max_new_tokens=150,
-                        temperature=0.5,
-                        do_sample=True
-                    )
-                    return response.strip() if isinstance(response, str) else str(response).strip()
-        except Exception as e:
-            logger.debug(f"Error generating criterion insights: {e}")
-            return None
+        criteria_text = "\n\n---\n\n".join(blocks)
+        prompt = CRITERION_INSIGHTS_PROMPT.format(criteria_text=criteria_text)
         
-        return None
+        return self._complete_text_map(prompt, max_tokens=150 * len(blocks), temperature=0.5)
     
-    def generate_enhanced_description(self, criterion_name: str, fw_data: Dict[str, Any], 
-                                      framework, all_framework_data: List[Dict[str, Any]]) -> Optional[str]:
+    def generate_criterion_insights(self, criterion_name: str, framework_data: List[Dict[str, Any]], 
+                                    selected_frameworks: List) -> Optional[str]:
         """
-        Generate an LLM-enhanced description for a criterion in a specific framework.
-        This provides a more comprehensive, AI-generated description that is framework-specific.
+        Generate detailed insights about how different frameworks handle a criterion.
         """
         if self.provider == 'none':
-            logger.debug(f"LLM provider is 'none', skipping enhanced description for {criterion_name} in {framework.name}")
             return None
         
-        desc = fw_data.get('description', '')
-        defs = fw_data.get('definitions', [])
-        category = fw_data.get('category', '')
+        framework_info = self._framework_approaches(framework_data, selected_frameworks)
+        if len(framework_info) < 2:
+            return None
+        
+        prompt = CRITERION_INSIGHT_PROMPT.format(
+            criterion_name=criterion_name,
+            approaches='\n'.join(f'- {info}' for info in framework_info)
+        )
+        
+        # Insights are only generated with Hugging Face
+        if self.provider != 'huggingface':
+            return None
+        # The prompt asks for 2-3 sentences
+        return self._invoke(prompt, 150, 0.5, sentences=3)
+    
+    def _enhanced_description_prompt(self, criterion_name: str, fw_data: Dict[str, Any], framework) -> str:
+        """Build the prompt for a framework-specific criterion description"""
+        desc = _clip(fw_data.get('description', ''), PROMPT_DESCRIPTION_CHARS)
+        defs = _clip_definitions(fw_data.get('definitions', []))
+        category = _clip(fw_data.get('category', ''), PROMPT_CATEGORY_CHARS)
         
         # Build framework-specific context
         framework_context = f"Framework: {framework.name}"
@@ -696,120 +1621,80 @@ Be concise and actionable. Return only the insight text, no markdown."""
             framework_context += f"\nDefinitions in this framework: {'; '.join(defs[:2])}"
         
         # Build prompt that emphasizes framework-specificity
-        prompt = f"""You are analyzing knowledge graph quality frameworks. Provide a clear, comprehensive 2-3 sentence description of the criterion "{criterion_name}" SPECIFICALLY as it is used in the framework "{framework.name}".
-
-{framework_context}
-
-IMPORTANT: Your description must be specific to how {framework.name} defines and uses this criterion. Do not provide a generic description. Focus on:
-1. How THIS SPECIFIC FRAMEWORK ({framework.name}) defines or measures this criterion
-2. What makes this criterion's interpretation unique or notable in {framework.name}
-3. The practical significance of this criterion within {framework.name}'s approach
-
-Return only the description text, no markdown, no labels, no quotes."""
+        return ENHANCED_DESCRIPTION_PROMPT.format(
+            criterion_name=criterion_name,
+            framework_name=framework.name,
+            framework_context=framework_context
+        )
+    
+    @cached_llm_result('generate_enhanced_description', temperature=0.4, key=_enhanced_description_key)
+    async def agenerate_enhanced_description(self, criterion_name: str, fw_data: Dict[str, Any],
+                                             framework, all_framework_data: List[Dict[str, Any]]) -> Optional[str]:
+        """Async variant of generate_enhanced_description()"""
+        if self.provider == 'none':
+            return None
+        return await self._acall_llm(
+            self._enhanced_description_prompt(criterion_name, fw_data, framework),
+            max_tokens=150,
+            temperature=0.4,
+            system=f"You are an expert in knowledge graph quality frameworks. Provide framework-specific descriptions for criteria as used in {framework.name}."
+        )
+    
+    def generate_enhanced_descriptions_concurrently(self, items: List[Tuple[str, Dict[str, Any], Any, List[Dict[str, Any]]]]) -> List[Any]:
+        """
+        Generate enhanced descriptions for (criterion_name, fw_data, framework,
+        all_framework_data) tuples, sending the requests concurrently. Returns one
+        result per item, in order: the description, None, or the raised exception.
+        """
+        if self.provider == 'none' or not items:
+            return [None] * len(items)
         
-        try:
-            if self.provider == 'openai':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.warning("OpenAI client not initialized")
-                    return None
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": f"You are an expert in knowledge graph quality frameworks. Provide framework-specific descriptions for criteria as used in {framework.name}."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.4,
-                        max_tokens=150
-                    )
-                    result = response.choices[0].message.content.strip()
-                    logger.debug(f"Generated enhanced description for {criterion_name} in {framework.name} (OpenAI)")
-                    return result
-                except Exception as e:
-                    logger.error(f"OpenAI API error generating enhanced description: {e}")
-                    return None
-            elif self.provider == 'ollama':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.warning("Ollama client not initialized")
-                    return None
-                model = getattr(self, 'ollama_model', 'llama3.2')
-                if not model:
-                    logger.warning("Ollama model not set")
-                    return None
+        results = self._run_concurrently(lambda: [self.agenerate_enhanced_description(*item) for item in items])
+        if results is None:
+            results = []
+            for item in items:
                 try:
-                    response = self.client.generate(
-                        model=model,
-                        prompt=prompt,
-                        options={'temperature': 0.4, 'num_predict': 150}
-                    )
-                    if isinstance(response, dict):
-                        result = response.get('response', '').strip()
-                    elif hasattr(response, 'response'):
-                        result = response.response.strip()
-                    else:
-                        result = str(response).strip()
-                    logger.debug(f"Generated enhanced description for {criterion_name} in {framework.name} (Ollama)")
-                    return result
+                    results.append(self.generate_enhanced_description(*item))
                 except Exception as e:
-                    logger.error(f"Ollama API error generating enhanced description: {e}")
-                    return None
-            elif self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.warning("Hugging Face client not initialized")
-                    return None
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                try:
-                    # Use chat completion API for conversational models
-                    messages = [{"role": "user", "content": prompt}]
-                    response = self.client.chat_completion(
-                        model=model,
-                        messages=messages,
-                        max_tokens=150,
-                        temperature=0.4
-                    )
-                    # Extract text from chat completion response
-                    if hasattr(response, 'choices') and len(response.choices) > 0:
-                        result = response.choices[0].message.content.strip()
-                    elif isinstance(response, dict) and 'choices' in response:
-                        result = response['choices'][0]['message']['content'].strip()
-                    else:
-                        result = str(response).strip()
-                    logger.debug(f"Generated enhanced description for {criterion_name} in {framework.name} (HuggingFace)")
-                    return result
-                except Exception as chat_error:
-                    logger.debug(f"Chat completion failed: {chat_error}, trying text generation...")
-                    try:
-                        # Fallback to text generation with a simpler model
-                        response = self.client.text_generation(
-                            prompt,
-                            model='google/flan-t5-large',
-                            max_new_tokens=150,
-                            temperature=0.4,
-                            do_sample=True
-                        )
-                        result = response.strip() if isinstance(response, str) else str(response).strip()
-                        logger.debug(f"Generated enhanced description for {criterion_name} in {framework.name} (HuggingFace, fallback)")
-                        return result
-                    except Exception as simple_error:
-                        logger.warning(f"All methods failed for {criterion_name} in {framework.name}: {simple_error}")
-                        return None
-            else:
-                logger.warning(f"Unsupported provider for enhanced description: {self.provider}")
-                return None
-        except Exception as e:
-            logger.error(f"Error generating enhanced description for {criterion_name} in {framework.name}: {e}", exc_info=True)
-            return None
-        
-        return None
+                    results.append(e)
+        return results
     
-    def generate_unique_criterion_insight(self, criterion_name: str, framework_data: List[Dict[str, Any]], 
-                                         selected_frameworks: List) -> Optional[str]:
+    def needs_enhanced_description(self, fw_data: Dict[str, Any], framework) -> bool:
         """
-        Generate insight for a criterion that appears in only one framework.
+        Whether a criterion's description in a framework is worth enhancing. A
+        long description that already refers to the framework by name is kept
+        as is, saving the LLM call.
+        """
+        desc = fw_data.get('description') or ''
+        if self.description_skip_chars is None or len(desc) < self.description_skip_chars:
+            return True
+        return framework.name.lower() not in desc.lower()
+    
+    @cached_llm_result('generate_enhanced_description', temperature=0.4, key=_enhanced_description_key)
+    def generate_enhanced_description(self, criterion_name: str, fw_data: Dict[str, Any], 
+                                      framework, all_framework_data: List[Dict[str, Any]]) -> Optional[str]:
+        """
+        Generate an LLM-enhanced description for a criterion in a specific framework.
+        This provides a more comprehensive, AI-generated description that is framework-specific.
         """
         if self.provider == 'none':
+            logger.debug(f"LLM provider is 'none', skipping enhanced description for {criterion_name} in {framework.name}")
             return None
         
+        prompt = self._enhanced_description_prompt(criterion_name, fw_data, framework)
+        # The prompt asks for 2-3 sentences
+        return self._invoke(
+            prompt, 150, 0.4,
+            system=f"You are an expert in knowledge graph quality frameworks. Provide framework-specific descriptions for criteria as used in {framework.name}.",
+            sentences=3
+        )
+    
+    def _unique_criterion_context(self, criterion_name: str, framework_data: List[Dict[str, Any]],
+                                  fw_names: List[str]) -> Optional[str]:
+        """
+        Describe a criterion found in only one framework, or None if no selected
+        framework has it. fw_names are the names of the selected frameworks.
+        """
         # Find which framework has this criterion
         framework_idx = None
         for i, fw_data in enumerate(framework_data):
@@ -817,124 +1702,98 @@ Return only the description text, no markdown, no labels, no quotes."""
                 framework_idx = i
                 break
         
-        if framework_idx is None or framework_idx >= len(selected_frameworks):
+        if framework_idx is None or framework_idx >= len(fw_names):
             return None
         
-        framework = selected_frameworks[framework_idx]
         fw_data = framework_data[framework_idx]
         
-        desc = fw_data.get('description', '')
-        defs = fw_data.get('definitions', [])
-        category = fw_data.get('category', '')
+        desc = _clip(fw_data.get('description', ''), PROMPT_DESCRIPTION_CHARS)
+        defs = _clip_definitions(fw_data.get('definitions', []))
+        category = _clip(fw_data.get('category', ''), PROMPT_CATEGORY_CHARS)
         
-        other_frameworks = [fw.name for i, fw in enumerate(selected_frameworks) if i != framework_idx]
+        return UNIQUE_CRITERION_CONTEXT.format(
+            criterion_name=criterion_name,
+            framework_name=fw_names[framework_idx],
+            other_frameworks=', '.join(fw_names[:framework_idx] + fw_names[framework_idx + 1:]),
+            category=category or 'Not specified',
+            description=desc or 'Not provided',
+            definitions='; '.join(defs[:2]) if defs else 'Not provided'
+        )
+    
+    def generate_unique_criterion_insights_batch(self, items: List[Tuple[str, List[Dict[str, Any]]]],
+                                                 selected_frameworks: List) -> Dict[str, str]:
+        """
+        Generate insights for several single-framework criteria with a single LLM
+        call. items is a list of (criterion_name, framework_data) pairs; returns a
+        dict mapping criterion names to insights.
+        """
+        # Insights are only generated with Hugging Face, as in generate_unique_criterion_insight()
+        if self.provider != 'huggingface' or not items:
+            return {}
         
-        prompt = f"""The criterion "{criterion_name}" appears only in the framework "{framework.name}" but not in: {', '.join(other_frameworks)}.
-
-Details from {framework.name}:
-- Category: {category or 'Not specified'}
-- Description: {desc or 'Not provided'}
-- Definitions: {'; '.join(defs[:2]) if defs else 'Not provided'}
-
-Provide a brief 1-2 sentence insight about:
-1. Why this criterion might be unique to this framework
-2. Its potential importance or relevance
-
-Be concise. Return only the insight text."""
+        fw_names = [fw.name for fw in selected_frameworks]
+        blocks = []
+        for criterion_name, framework_data in items:
+            context = self._unique_criterion_context(criterion_name, framework_data, fw_names)
+            if context is not None:
+                blocks.append(context)
+        if not blocks:
+            return {}
         
-        try:
-            if self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    return None
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                try:
-                    formatted_prompt = f"<|user|>\n{prompt}<|end|>\n<|assistant|>\n"
-                    response = self.client.text_generation(
-                        formatted_prompt,
-                        model=model,
-                        max_new_tokens=100,
-                        temperature=0.5,
-                        do_sample=True
-                    )
-                    return response.strip() if isinstance(response, str) else str(response).strip()
-                except:
-                    response = self.client.text_generation(
-                        prompt,
-                        model=model,
-                        max_new_tokens=100,
-                        temperature=0.5,
-                        do_sample=True
-                    )
-                    return response.strip() if isinstance(response, str) else str(response).strip()
-        except Exception as e:
-            logger.debug(f"Error generating unique criterion insight: {e}")
+        criteria_text = "\n\n---\n\n".join(blocks)
+        prompt = UNIQUE_INSIGHTS_PROMPT.format(criteria_text=criteria_text)
+        
+        return self._complete_text_map(prompt, max_tokens=100 * len(blocks), temperature=0.5)
+    
+    def generate_unique_criterion_insight(self, criterion_name: str, framework_data: List[Dict[str, Any]], 
+                                         selected_frameworks: List,
+                                         fw_names: Optional[List[str]] = None) -> Optional[str]:
+        """
+        Generate insight for a criterion that appears in only one framework.
+        Callers looping over criteria can pass the framework names, computed once.
+        """
+        # Insights are only generated with Hugging Face
+        if self.provider != 'huggingface':
             return None
         
-        return None
+        if fw_names is None:
+            fw_names = [fw.name for fw in selected_frameworks]
+        context = self._unique_criterion_context(criterion_name, framework_data, fw_names)
+        if context is None:
+            return None
+        
+        prompt = UNIQUE_INSIGHT_PROMPT.format(context=context)
+        # The prompt asks for 1-2 sentences
+        return self._invoke(prompt, 100, 0.5, sentences=2)
     
     def generate_overall_insights(self, comparison_data: List[Dict[str, Any]], 
                                   selected_frameworks: List,
                                   semantic_similarities: Dict,
-                                  summaries: Dict) -> Optional[str]:
+                                  summaries: Dict,
+                                  coverage: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Generate overall insights about the comparison between frameworks.
+        coverage is the result of _criteria_coverage(comparison_data), if already computed.
         """
-        if self.provider == 'none':
+        # Insights are only generated with Hugging Face
+        if self.provider != 'huggingface':
             return None
         
+        if coverage is None:
+            coverage = _criteria_coverage(comparison_data)
         framework_names = [fw.name for fw in selected_frameworks]
-        total_criteria = len(comparison_data)
-        common_criteria = sum(1 for c in comparison_data 
-                            if all(fw.get('has_criterion') for fw in c.get('framework_data', [])))
-        unique_criteria = sum(1 for c in comparison_data 
-                            if sum(1 for fw in c.get('framework_data', []) if fw.get('has_criterion')) == 1)
-        similar_pairs = len(semantic_similarities)
-        
-        prompt = f"""Analyze this comparison of {len(selected_frameworks)} knowledge graph quality frameworks: {', '.join(framework_names)}.
-
-Statistics:
-- Total unique criteria: {total_criteria}
-- Criteria in all frameworks: {common_criteria}
-- Criteria unique to one framework: {unique_criteria}
-- Semantically similar criteria pairs: {similar_pairs}
-
-Provide 3-4 sentences with overall insights:
-1. Key strengths of each framework
-2. Major differences in approach
-3. Recommendations for choosing or combining frameworks
-4. Notable gaps or overlaps
-
-Be insightful and practical. Return only the insight text, no markdown."""
         
-        try:
-            if self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    return None
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                try:
-                    formatted_prompt = f"<|user|>\n{prompt}<|end|>\n<|assistant|>\n"
-                    response = self.client.text_generation(
-                        formatted_prompt,
-                        model=model,
-                        max_new_tokens=250,
-                        temperature=0.5,
-                        do_sample=True
-                    )
-                    return response.strip() if isinstance(response, str) else str(response).strip()
-                except:
-                    response = self.client.text_generation(
-                        prompt,
-                        model=model,
-                        max_new_tokens=250,
-                        temperature=0.5,
-                        do_sample=True
-                    )
-                    return response.strip() if isinstance(response, str) else str(response).strip()
-        except Exception as e:
-            logger.debug(f"Error generating overall insights: {e}")
-            return None
+        prompt = OVERALL_INSIGHTS_PROMPT.format(
+            framework_count=len(selected_frameworks),
+            framework_names=', '.join(framework_names),
+            total_criteria=len(comparison_data),
+            common_criteria=coverage['common_count'],
+            unique_criteria=len(coverage['unique']),
+            similar_pairs=len(semantic_similarities)
+        )
         
-        return None
+        # The prompt asks for 3-4 sentences
+        return self._invoke(prompt, 250, 0.5, sentences=4)
     
     def group_related_criteria(self, criteria_list: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """
@@ -954,157 +1813,271 @@ Be insightful and practical. Return only the insight text, no markdown."""
     
     def _group_criteria_embeddings(self, criteria_list: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """Group criteria using embeddings and clustering"""
-        from sklearn.cluster import DBSCAN
+        import numpy as np
         
         if not self.model:
             return {}
         
         try:
-            # Create embeddings
-            texts = [f"{c.get('name', '')}. {c.get('description', '')[:100]}" for c in criteria_list]
+            # Same texts as similarity search, so both stages share cached vectors
+            texts = [self._embedding_text(c) for c in criteria_list]
             if not texts:
                 return {}
             
-            embeddings = self.model.encode(texts)
+            embeddings = self._encode(texts)
             
-            # Cluster using DBSCAN
-            clustering = DBSCAN(eps=0.5, min_samples=2, metric='cosine')
-            labels = clustering.fit_predict(embeddings)
+            # Groups are the connected components of the "similarity >= threshold"
+            # graph (what DBSCAN with min_samples=2 computes). Embeddings are
+            # unit-length, so a block of similarities is one matrix product.
+            parent = list(range(len(texts)))
             
-            # Group by cluster
-            groups = {}
-            for i, label in enumerate(labels):
-                if label >= 0:  # Ignore noise points (label -1)
-                    group_name = f"Group {label + 1}"
-                    if group_name not in groups:
-                        groups[group_name] = []
-                    groups[group_name].append(criteria_list[i].get('name', ''))
+            def find(i):
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
             
-            return groups
+            for start in range(0, len(texts), GROUP_SIMILARITY_BLOCK):
+                block = embeddings[start:start + GROUP_SIMILARITY_BLOCK] @ embeddings.T
+                rows, cols = np.nonzero(block >= GROUP_SIMILARITY_THRESHOLD)
+                for i, j in zip((rows + start).tolist(), cols.tolist()):
+                    if i < j:
+                        root_i, root_j = find(i), find(j)
+                        if root_i != root_j:
+                            parent[max(root_i, root_j)] = min(root_i, root_j)
+            
+            # Group by component, numbered in order of first member; criteria with
+            # no similar neighbour are left out
+            members = {}
+            for i in range(len(texts)):
+                members.setdefault(find(i), []).append(criteria_list[i].get('name', ''))
+            clusters = [names for names in members.values() if len(names) > 1]
+            return {f"Group {n}": names for n, names in enumerate(clusters, 1)}
         except Exception as e:
             logger.error(f"Error in clustering criteria: {e}")
             return {}
     
+    @cached_llm_result('_group_criteria_llm', temperature=0.3)
     def _group_criteria_llm(self, criteria_list: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         """Group criteria using LLM"""
         criteria_text = "\n".join([
-            f"- {c.get('name', '')}: {c.get('description', '')[:80]}"
+            f"- {c.get('name', '')}: {_clip(c.get('description', ''), 80)}"
             for c in criteria_list[:15]
         ])
         
-        prompt = f"""Group these knowledge graph quality criteria into related categories based on their conceptual similarity.
+        prompt = GROUPING_PROMPT.format(criteria_text=criteria_text)
+        result_text = self._invoke(
+            prompt, 800, 0.3,
+            system="You are an expert in knowledge graph quality frameworks. Group related criteria.",
+            json_mode=True,
+            json_schema=NAME_LISTS_SCHEMA
+        )
+        if not result_text:
+            return {}
+        
+        try:
+            # Extract JSON
+            return _parse_json_response(result_text)
+        except Exception as e:
+            logger.error(f"Error grouping criteria: {e}")
+            return {}
 
-Criteria:
-{criteria_text}
 
-Return a JSON object with category names as keys and lists of criterion names as values. Use meaningful category names like "Completeness-related", "Accuracy-related", etc.
+@functools.lru_cache(maxsize=1)
+def _shared_engine() -> LLMComparisonEngine:
+    return LLMComparisonEngine()
 
-Format: {{"Category Name": ["Criterion 1", "Criterion 2"]}}
 
-Return only valid JSON."""
+def get_engine() -> LLMComparisonEngine:
+    """
+    Return the process-wide LLMComparisonEngine. Provider detection, client
+    setup and model loading happen once per process instead of per request;
+    call get_engine.cache_clear() to force re-detection. An engine whose
+    provider failed its health check is replaced after PROVIDER_PROBE_TTL.
+    """
+    engine = _shared_engine()
+    if engine.unavailable_since is not None and time.monotonic() - engine.unavailable_since > PROVIDER_PROBE_TTL:
+        _shared_engine.cache_clear()
+        engine = _shared_engine()
+    return engine
 
-        try:
-            if self.provider == 'openai':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("OpenAI client not initialized")
-                    return {}
-                try:
-                    response = self.client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[
-                            {"role": "system", "content": "You are an expert in knowledge graph quality frameworks. Group related criteria."},
-                            {"role": "user", "content": prompt}
-                        ],
-                        temperature=0.3,
-                        max_tokens=800
-                    )
-                    result_text = response.choices[0].message.content.strip()
-                except Exception as e:
-                    logger.error(f"OpenAI API error: {e}")
-                    return {}
-            elif self.provider == 'ollama':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("Ollama client not initialized")
-                    return {}
-                model = getattr(self, 'ollama_model', 'llama3.2')
-                if not model:
-                    logger.error("Ollama model not set")
-                    return {}
-                try:
-                    response = self.client.generate(
-                        model=model,
-                        prompt=prompt,
-                        options={'temperature': 0.3}
-                    )
-                    # Handle different response formats
-                    if isinstance(response, dict):
-                        result_text = response.get('response', '').strip()
-                    elif hasattr(response, 'response'):
-                        result_text = response.response.strip()
-                    else:
-                        result_text = str(response).strip()
-                except Exception as e:
-                    logger.error(f"Ollama API error: {e}")
-                    return {}
-            elif self.provider == 'huggingface':
-                if not hasattr(self, 'client') or self.client is None:
-                    logger.error("Hugging Face client not initialized")
-                    return {}
-                model = getattr(self, 'hf_model', 'meta-llama/Llama-3.2-3B-Instruct')
-                try:
-                    # Hugging Face InferenceClient API: model is passed to text_generation
-                    # Try with instruction format first (for Phi-3 and similar models)
-                    try:
-                        formatted_prompt = f"<|user|>\n{prompt}<|end|>\n<|assistant|>\n"
-                        response = self.client.text_generation(
-                            formatted_prompt,
-                            model=model,
-                            max_new_tokens=800,
-                            temperature=0.3,
-                            do_sample=True
-                        )
-                        result_text = response.strip() if isinstance(response, str) else str(response).strip()
-                    except Exception as format_error:
-                        # Fallback to simple prompt format
-                        logger.debug(f"Instruction format failed, trying simple format: {format_error}")
-                        response = self.client.text_generation(
-                            prompt,
-                            model=model,
-                            max_new_tokens=800,
-                            temperature=0.3,
-                            do_sample=True
-                        )
-                        result_text = response.strip() if isinstance(response, str) else str(response).strip()
-                except Exception as e:
-                    logger.error(f"Hugging Face API error with {model}: {e}")
-                    # Try fallback model if main model fails
-                    try:
-                        logger.info("Trying fallback model: google/flan-t5-large")
-                        response = self.client.text_generation(
-                            prompt,
-                            model='google/flan-t5-large',
-                            max_new_tokens=800,
-                            temperature=0.3
-                        )
-                        result_text = response.strip() if isinstance(response, str) else str(response).strip()
-                    except Exception as e2:
-                        logger.error(f"Hugging Face fallback also failed: {e2}")
-                        return {}
-            else:
-                return {}
-            
-            # Extract JSON
-            import re
-            json_match = re.search(r'\{.*\}', result_text, re.DOTALL)
-            if json_match:
-                result_text = json_match.group(0)
+
+get_engine.cache_clear = _shared_engine.cache_clear
+
+
+def _criteria_coverage(comparison_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Count in one pass how many frameworks have each criterion. Returns the
+    criteria found in 2+ frameworks ('multi_framework') and in exactly one
+    ('unique'), the number of criteria found in every framework ('common_count')
+    and the number of criterion-framework combinations ('combinations').
+    """
+    multi_framework, unique = [], []
+    common_count = combinations = 0
+    for criterion in comparison_data:
+        framework_data = criterion.get('framework_data', [])
+        present = sum(1 for fw in framework_data if fw.get('has_criterion'))
+        combinations += present
+        if present >= 2:
+            multi_framework.append(criterion)
+        elif present == 1:
+            unique.append(criterion)
+        if present == len(framework_data):
+            common_count += 1
+    return {
+        'multi_framework': multi_framework,
+        'unique': unique,
+        'common_count': common_count,
+        'combinations': combinations,
+    }
+
+
+def _find_similarities_and_groups(engine: LLMComparisonEngine,
+                                  comparison_data: List[Dict[str, Any]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """
+    Steps 1 and 3 of enhance_comparison_with_llm(). They run one after the
+    other so grouping reuses the embeddings computed for the similarity search.
+    """
+    # Find semantic similarities
+    logger.info("Step 1/3: Finding semantic similarities...")
+    try:
+        similarity_start = time.time()
+        semantic_similarities = engine.find_semantic_similarities(comparison_data)
+        similarity_time = time.time() - similarity_start
+        logger.info(f"Semantic similarities found: {len(semantic_similarities)} in {similarity_time:.2f}s")
+    except Exception as e:
+        logger.error(f"Error finding semantic similarities: {e}", exc_info=True)
+        semantic_similarities = {}
+    
+    # Group related criteria
+    logger.info("Step 3/3: Grouping related criteria...")
+    try:
+        group_start = time.time()
+        groups = engine.group_related_criteria(comparison_data)
+        group_time = time.time() - group_start
+        logger.info(f"Created {len(groups)} groups in {group_time:.2f}s")
+    except Exception as e:
+        logger.error(f"Error grouping criteria: {e}", exc_info=True)
+        groups = {}
+    
+    return semantic_similarities, groups
+
+
+def _generate_descriptions_and_summaries(engine: LLMComparisonEngine,
+                                         comparison_data: List[Dict[str, Any]],
+                                         selected_frameworks: List,
+                                         coverage: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, str], Dict[str, str]]:
+    """
+    Step 2 of enhance_comparison_with_llm(). Returns the enhanced descriptions
+    (keyed by "<criterion name>__<framework index>"), summaries and insights.
+    """
+    # Generate LLM-enhanced descriptions for each criterion in each framework
+    logger.info("Step 2/3: Generating LLM-enhanced descriptions and insights...")
+    summaries = {}
+    insights = {}
+    enhanced_descriptions = {}  # Map: (criterion_name, framework_index) -> enhanced_description
+    summary_count = 0
+    try:
+        summary_start = time.time()
+        
+        # Generate enhanced descriptions for each criterion-framework combination
+        logger.info(f"Generating LLM-enhanced descriptions for {coverage['combinations']} criterion-framework combinations...")
+        
+        # Collect every combination first so the requests can be sent concurrently
+        keys = []
+        requests_to_send = []
+        skipped_count = 0
+        for criterion in comparison_data:
+            criterion_name = criterion.get('name', '')
+            framework_data = criterion.get('framework_data', [])
             
-            groups = json.loads(result_text)
-            return groups
+            for fw_idx, fw_data in enumerate(framework_data):
+                if fw_data.get('has_criterion') and fw_idx < len(selected_frameworks):
+                    if not engine.needs_enhanced_description(fw_data, selected_frameworks[fw_idx]):
+                        skipped_count += 1
+                        continue
+                    keys.append(f"{criterion_name}__{fw_idx}")
+                    # Pass all framework data for context
+                    requests_to_send.append((criterion_name, fw_data, selected_frameworks[fw_idx], framework_data))
+        
+        combination_count = len(requests_to_send)
+        if skipped_count:
+            logger.info(f"Skipped {skipped_count} criteria whose descriptions are already detailed")
+        success_count = 0
+        results = engine.generate_enhanced_descriptions_concurrently(requests_to_send)
+        for key, (criterion_name, _, framework, _), enhanced_desc in zip(keys, requests_to_send, results):
+            if isinstance(enhanced_desc, Exception):
+                logger.warning(f"Error generating enhanced description for '{criterion_name}' in '{framework.name}': {enhanced_desc}")
+            elif enhanced_desc:
+                enhanced_descriptions[key] = enhanced_desc
+                success_count += 1
+                logger.debug(f"✓ Enhanced description for '{criterion_name}' in '{framework.name}' ({len(enhanced_desc)} chars)")
+            else:
+                logger.debug(f"✗ No enhanced description generated for '{criterion_name}' in '{framework.name}'")
+        
+        logger.info(f"Enhanced descriptions: {success_count}/{combination_count} successful")
+        
+        # Generate summaries for criteria present in multiple frameworks
+        criteria_to_summarize = coverage['multi_framework']
+        logger.info(f"Found {len(criteria_to_summarize)} criteria to summarize")
+        
+        # Summaries are requested in batches instead of one call per criterion
+        for start in range(0, len(criteria_to_summarize), SUMMARY_BATCH_SIZE):
+            batch = criteria_to_summarize[start:start + SUMMARY_BATCH_SIZE]
+            try:
+                logger.debug(f"Generating summaries {start + 1}-{start + len(batch)}/{len(criteria_to_summarize)}")
+                batch_summaries = engine.generate_comparison_summaries(
+                    [(c.get('name', ''), c.get('framework_data', [])) for c in batch]
+                )
+            except Exception as e:
+                logger.warning(f"Error generating batched summaries: {e}")
+                batch_summaries = {}
             
+            summaries.update(batch_summaries)
+        
+        # Criteria missing from the batched responses are requested individually, concurrently
+        missing = [
+            (c.get('name', ''), c.get('framework_data', []))
+            for c in criteria_to_summarize if c.get('name', '') not in summaries
+        ]
+        if missing:
+            try:
+                summaries.update(engine.generate_comparison_summaries_concurrently(missing))
+            except Exception as e:
+                logger.warning(f"Error generating individual summaries: {e}")
+        summary_count = len(summaries)
+        
+        # Generate additional insights for criteria in multiple frameworks, in batches
+        for start in range(0, len(criteria_to_summarize), SUMMARY_BATCH_SIZE):
+            batch = criteria_to_summarize[start:start + SUMMARY_BATCH_SIZE]
+            try:
+                insights.update(engine.generate_criterion_insights_batch(
+                    [(c.get('name', ''), c.get('framework_data', [])) for c in batch],
+                    selected_frameworks
+                ))
+            except Exception as e:
+                logger.warning(f"Error generating batched insights: {e}")
+        
+        # Generate insights for unique criteria (only in one framework)
+        logger.info("Generating insights for unique criteria...")
+        unique_criteria = coverage['unique']
+        logger.info(f"Found {len(unique_criteria)} unique criteria")
+        
+        # Limit to 10 to keep the prompt small; they all go in one request
+        try:
+            insights.update(engine.generate_unique_criterion_insights_batch(
+                [(c.get('name', ''), c.get('framework_data', [])) for c in unique_criteria[:10]],
+                selected_frameworks
+            ))
         except Exception as e:
-            logger.error(f"Error grouping criteria: {e}")
-            return {}
+            logger.warning(f"Error generating unique criterion insights: {e}")
+                
+        summary_time = time.time() - summary_start
+        logger.info(f"Generated {len(enhanced_descriptions)} enhanced descriptions, {summary_count} summaries and {len(insights)} insights in {summary_time:.2f}s")
+    except Exception as e:
+        logger.error(f"Error generating summaries: {e}", exc_info=True)
+    
+    return enhanced_descriptions, summaries, insights
 
 
 def enhance_comparison_with_llm(comparison_data: List[Dict[str, Any]], 
@@ -1112,6 +2085,7 @@ def enhance_comparison_with_llm(comparison_data: List[Dict[str, Any]],
     """
     Enhance comparison data with LLM-generated insights.
     Returns enhanced comparison data with semantic similarities, summaries, and groupings.
+    The framework_data dicts in comparison_data are updated in place.
     """
     import time
     start_time = time.time()
@@ -1121,7 +2095,7 @@ def enhance_comparison_with_llm(comparison_data: List[Dict[str, Any]],
     
     try:
         logger.info("Initializing LLM engine...")
-        engine = LLMComparisonEngine()
+        engine = get_engine()
         logger.info(f"LLM Provider detected: {engine.provider}")
         
         if engine.provider == 'none':
@@ -1134,124 +2108,16 @@ def enhance_comparison_with_llm(comparison_data: List[Dict[str, Any]],
                 'groups': {}
             }
         
-        # Find semantic similarities
-        logger.info("Step 1/3: Finding semantic similarities...")
-        try:
-            similarity_start = time.time()
-            semantic_similarities = engine.find_semantic_similarities(comparison_data)
-            similarity_time = time.time() - similarity_start
-            logger.info(f"Semantic similarities found: {len(semantic_similarities)} in {similarity_time:.2f}s")
-        except Exception as e:
-            logger.error(f"Error finding semantic similarities: {e}", exc_info=True)
-            semantic_similarities = {}
+        coverage = _criteria_coverage(comparison_data)
         
-        # Generate LLM-enhanced descriptions for each criterion in each framework
-        logger.info("Step 2/3: Generating LLM-enhanced descriptions and insights...")
-        summaries = {}
-        insights = {}
-        enhanced_descriptions = {}  # Map: (criterion_name, framework_index) -> enhanced_description
-        summary_count = 0
-        try:
-            summary_start = time.time()
-            
-            # Generate enhanced descriptions for each criterion-framework combination
-            total_combinations = sum(
-                sum(1 for fw_data in criterion.get('framework_data', []) if fw_data.get('has_criterion'))
-                for criterion in comparison_data
+        # Step 2 only makes LLM calls, while steps 1 and 3 only need embeddings
+        # (or one LLM call each), so they run alongside each other
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            similarities_and_groups = executor.submit(_find_similarities_and_groups, engine, comparison_data)
+            enhanced_descriptions, summaries, insights = _generate_descriptions_and_summaries(
+                engine, comparison_data, selected_frameworks, coverage
             )
-            logger.info(f"Generating LLM-enhanced descriptions for {total_combinations} criterion-framework combinations...")
-            
-            combination_count = 0
-            success_count = 0
-            for criterion in comparison_data:
-                criterion_name = criterion.get('name', '')
-                framework_data = criterion.get('framework_data', [])
-                
-                for fw_idx, fw_data in enumerate(framework_data):
-                    if fw_data.get('has_criterion') and fw_idx < len(selected_frameworks):
-                        framework = selected_frameworks[fw_idx]
-                        key = f"{criterion_name}__{fw_idx}"
-                        combination_count += 1
-                        
-                        try:
-                            # Generate enhanced description using LLM
-                            enhanced_desc = engine.generate_enhanced_description(
-                                criterion_name, 
-                                fw_data, 
-                                framework,
-                                framework_data  # Pass all framework data for context
-                            )
-                            if enhanced_desc:
-                                enhanced_descriptions[key] = enhanced_desc
-                                success_count += 1
-                                logger.debug(f"✓ Enhanced description for '{criterion_name}' in '{framework.name}' ({len(enhanced_desc)} chars)")
-                            else:
-                                logger.debug(f"✗ No enhanced description generated for '{criterion_name}' in '{framework.name}'")
-                        except Exception as e:
-                            logger.warning(f"Error generating enhanced description for '{criterion_name}' in '{framework.name}': {e}")
-                            continue
-            
-            logger.info(f"Enhanced descriptions: {success_count}/{combination_count} successful")
-            
-            # Generate summaries for criteria present in multiple frameworks
-            criteria_to_summarize = [c for c in comparison_data 
-                                   if sum(1 for fw in c.get('framework_data', []) if fw.get('has_criterion')) >= 2]
-            logger.info(f"Found {len(criteria_to_summarize)} criteria to summarize")
-            
-            for idx, criterion in enumerate(criteria_to_summarize, 1):
-                criterion_name = criterion.get('name', '')
-                framework_data = criterion.get('framework_data', [])
-                
-                try:
-                    logger.debug(f"Generating summary {idx}/{len(criteria_to_summarize)}: {criterion_name}")
-                    summary = engine.generate_comparison_summary(criterion_name, framework_data)
-                    if summary:
-                        summaries[criterion_name] = summary
-                        summary_count += 1
-                        logger.debug(f"Summary generated for {criterion_name} ({len(summary)} chars)")
-                    
-                    # Generate additional insights for criteria in multiple frameworks
-                    insight = engine.generate_criterion_insights(criterion_name, framework_data, selected_frameworks)
-                    if insight:
-                        insights[criterion_name] = insight
-                except Exception as e:
-                    logger.warning(f"Error generating summary for {criterion_name}: {e}")
-                    continue
-            
-            # Generate insights for unique criteria (only in one framework)
-            logger.info("Generating insights for unique criteria...")
-            unique_criteria = [c for c in comparison_data 
-                             if sum(1 for fw in c.get('framework_data', []) if fw.get('has_criterion')) == 1]
-            logger.info(f"Found {len(unique_criteria)} unique criteria")
-            
-            for idx, criterion in enumerate(unique_criteria[:10], 1):  # Limit to 10 to avoid too many API calls
-                criterion_name = criterion.get('name', '')
-                framework_data = criterion.get('framework_data', [])
-                
-                try:
-                    logger.debug(f"Generating insight for unique criterion {idx}/{min(10, len(unique_criteria))}: {criterion_name}")
-                    insight = engine.generate_unique_criterion_insight(criterion_name, framework_data, selected_frameworks)
-                    if insight:
-                        insights[criterion_name] = insight
-                except Exception as e:
-                    logger.warning(f"Error generating insight for {criterion_name}: {e}")
-                    continue
-                    
-            summary_time = time.time() - summary_start
-            logger.info(f"Generated {len(enhanced_descriptions)} enhanced descriptions, {summary_count} summaries and {len(insights)} insights in {summary_time:.2f}s")
-        except Exception as e:
-            logger.error(f"Error generating summaries: {e}", exc_info=True)
-        
-        # Group related criteria
-        logger.info("Step 3/3: Grouping related criteria...")
-        try:
-            group_start = time.time()
-            groups = engine.group_related_criteria(comparison_data)
-            group_time = time.time() - group_start
-            logger.info(f"Created {len(groups)} groups in {group_time:.2f}s")
-        except Exception as e:
-            logger.error(f"Error grouping criteria: {e}", exc_info=True)
-            groups = {}
+            semantic_similarities, groups = similarities_and_groups.result()
         
         total_time = time.time() - start_time
         logger.info(f"=== LLM Enhancement Completed in {total_time:.2f}s ===")
@@ -1261,39 +2127,32 @@ def enhance_comparison_with_llm(comparison_data: List[Dict[str, Any]],
         logger.info("Generating overall comparison insights...")
         overall_insights = None
         try:
-            overall_insights = engine.generate_overall_insights(comparison_data, selected_frameworks, semantic_similarities, summaries)
+            overall_insights = engine.generate_overall_insights(
+                comparison_data, selected_frameworks, semantic_similarities, summaries, coverage
+            )
             if overall_insights:
                 logger.info(f"Overall insights generated ({len(overall_insights)} chars)")
         except Exception as e:
             logger.warning(f"Error generating overall insights: {e}")
             overall_insights = None
         
-        # Update comparison_data with enhanced descriptions
-        enhanced_comparison_data = []
+        # Mark up comparison_data in place with the enhanced descriptions;
+        # it is built per request by the caller, so copying it buys nothing
         for criterion in comparison_data:
             criterion_name = criterion.get('name', '')
-            enhanced_framework_data = []
-            
             for fw_idx, fw_data in enumerate(criterion.get('framework_data', [])):
-                enhanced_fw_data = fw_data.copy()
                 key = f"{criterion_name}__{fw_idx}"
                 
                 # Add LLM-enhanced description if available
                 if key in enhanced_descriptions:
-                    enhanced_fw_data['llm_description'] = enhanced_descriptions[key]
-                    enhanced_fw_data['has_llm_enhancement'] = True
+                    fw_data['llm_description'] = enhanced_descriptions[key]
+                    fw_data['has_llm_enhancement'] = True
                 else:
-                    enhanced_fw_data['has_llm_enhancement'] = False
-                
-                enhanced_framework_data.append(enhanced_fw_data)
-            
-            enhanced_criterion = criterion.copy()
-            enhanced_criterion['framework_data'] = enhanced_framework_data
-            enhanced_comparison_data.append(enhanced_criterion)
+                    fw_data['has_llm_enhancement'] = False
         
         return {
             'enhanced': True,
-            'comparison_data': enhanced_comparison_data,
+            'comparison_data': comparison_data,
             'semantic_similarities': semantic_similarities,
             'summaries': summaries,
             'insights': insights,
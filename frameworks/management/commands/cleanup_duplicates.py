@@ -4,12 +4,68 @@ Management command to clean up duplicate frameworks, criteria, and definitions.
 Usage:
     python manage.py cleanup_duplicates
     python manage.py cleanup_duplicates --dry-run
+    python manage.py cleanup_duplicates --fuzzy-threshold 90  # requires rapidfuzz
 """
-from django.core.management.base import BaseCommand
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.db.models import Count, Q
+from django.utils import timezone
+from frameworks import models
 from frameworks.models import Framework, Criterion, Definition
 
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+# Rows per bulk UPDATE or DELETE
+BATCH_SIZE = 500
+
+# Criteria loaded per chunk when scanning all definitions
+ITERATOR_CHUNK_SIZE = 500
+
+# Framework fields merged from duplicates: (field, prefer_longer). Empty fields on
+# the primary are always filled; prefer_longer fields also take a longer value.
+SCALAR_FIELDS = (
+    ('authors', False),
+    ('year', False),
+    ('title', False),
+    ('description', True),
+    ('objectives', True),
+    ('methodology', True),
+    ('algorithm_used', False),
+    ('top_model', False),
+    ('accuracy', False),
+    ('advantages', True),
+    ('drawbacks', True),
+    ('source', False),
+)
+
+# The same for criteria merged into another criterion
+CRITERION_FIELDS = (
+    ('description', True),
+    ('category', False),
+)
+
+
+# Same normalization as Framework.name_normalized
+normalize_name = lru_cache(maxsize=100_000)(models.normalize_name)
+
+
+@lru_cache(maxsize=100_000)
+def normalize_criterion_name(name):
+    """Normalize criterion name for comparison"""
+    if not name:
+        return ''
+    normalized = ' '.join(name.strip().split())
+    if normalized:
+        normalized = normalized[0].upper() + normalized[1:] if len(normalized) > 1 else normalized.upper()
+    return normalized
+
 
 class Command(BaseCommand):
     help = 'Clean up duplicate frameworks, criteria, and definitions'
@@ -20,24 +76,44 @@ class Command(BaseCommand):
             action='store_true',
             help='Run without actually deleting data',
         )
+        parser.add_argument(
+            '--fuzzy-threshold',
+            type=float,
+            default=None,
+            help='Treat definitions with a RapidFuzz similarity ratio at or above this (0-100) '
+                 'as near-duplicates, instead of checking whether one contains the other',
+        )
 
-    def normalize_name(self, name):
-        """Normalize a name for comparison"""
-        if not name:
-            return ''
-        return ' '.join(name.lower().strip().split())
+    def delete_by_ids(self, model, ids):
+        """Delete rows by primary key, one DELETE per batch of ids"""
+        # Batched to stay under the database's limit on query parameters. A regular
+        # delete() (not _raw_delete) so criteria and definitions still cascade.
+        for start in range(0, len(ids), BATCH_SIZE):
+            model.objects.filter(id__in=ids[start:start + BATCH_SIZE]).delete()
 
-    def normalize_criterion_name(self, name):
-        """Normalize criterion name for comparison"""
-        if not name:
-            return ''
-        normalized = ' '.join(name.strip().split())
-        if normalized:
-            normalized = normalized[0].upper() + normalized[1:] if len(normalized) > 1 else normalized.upper()
-        return normalized
+    def merge_fields(self, primary, duplicate, fields):
+        """Copy values from duplicate into primary per (field, prefer_longer); return the changed fields"""
+        changed = set()
+        for field, prefer_longer in fields:
+            duplicate_value = getattr(duplicate, field)
+            # An empty duplicate value never replaces anything
+            if not duplicate_value:
+                continue
+            primary_value = getattr(primary, field)
+            if not primary_value or (prefer_longer and len(duplicate_value) > len(primary_value)):
+                setattr(primary, field, duplicate_value)
+                changed.add(field)
+        return changed
 
     def handle(self, *args, **options):
         dry_run = options['dry_run']
+        fuzzy_threshold = options['fuzzy_threshold']
+        
+        if fuzzy_threshold is not None:
+            if not RAPIDFUZZ_AVAILABLE:
+                raise CommandError('--fuzzy-threshold requires rapidfuzz. Install with: pip install rapidfuzz')
+            if not 0 < fuzzy_threshold <= 100:
+                raise CommandError('--fuzzy-threshold must be between 0 and 100')
         
         if dry_run:
             self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be deleted'))
@@ -50,7 +126,7 @@ class Command(BaseCommand):
             criteria_merged = self.cleanup_duplicate_criteria(dry_run)
             
             # Clean up duplicate definitions
-            definitions_removed = self.cleanup_duplicate_definitions(dry_run)
+            definitions_removed = self.cleanup_duplicate_definitions(dry_run, fuzzy_threshold)
             
             if not dry_run:
                 self.stdout.write(self.style.SUCCESS(
@@ -66,13 +142,26 @@ class Command(BaseCommand):
     def cleanup_duplicate_frameworks(self, dry_run):
         """Merge duplicate frameworks"""
         merged_count = 0
+        duplicate_ids = []
+        # Criteria and definitions reassigned to another parent, written together
+        # after the pass so each becomes one CASE WHEN UPDATE per batch
+        moved_criteria = []
+        moved_definitions = []
+        now = timezone.now()
         
-        # Find frameworks with duplicate names (normalized)
-        all_frameworks = Framework.objects.all()
+        # Find normalized names shared by more than one framework, then load only
+        # those frameworks. Criteria and their definitions are prefetched so
+        # merging needs no per-object queries.
+        duplicate_names = Framework.objects.values('name_normalized').annotate(
+            count=Count('id')
+        ).filter(count__gt=1).order_by().values_list('name_normalized', flat=True)
+        duplicate_frameworks = Framework.objects.filter(
+            name_normalized__in=duplicate_names
+        ).prefetch_related('criteria__definitions')
         framework_groups = {}
         
-        for framework in all_frameworks:
-            normalized_name = self.normalize_name(framework.name)
+        for framework in duplicate_frameworks:
+            normalized_name = framework.name_normalized
             if normalized_name not in framework_groups:
                 framework_groups[normalized_name] = []
             framework_groups[normalized_name].append(framework)
@@ -97,94 +186,75 @@ class Command(BaseCommand):
                 
                 self.stdout.write(f'Merging {len(duplicates)} duplicate(s) into: {primary.name}')
                 
+                # Primary's criteria by name, with the texts of their definitions
+                primary_criteria = {c.name: c for c in primary.criteria.all()}
+                existing_texts = {
+                    c.id: {d.definition_text for d in c.definitions.all()}
+                    for c in primary_criteria.values()
+                }
+                
+                # Fields of primary changed by the merge, so only those are written
+                dirty_fields = set()
+                
                 for duplicate in duplicates:
                     # Merge data from duplicate into primary
-                    if not primary.authors and duplicate.authors:
-                        primary.authors = duplicate.authors
-                    if not primary.year and duplicate.year:
-                        primary.year = duplicate.year
-                    if not primary.title and duplicate.title:
-                        primary.title = duplicate.title
-                    if not primary.description and duplicate.description:
-                        primary.description = duplicate.description
-                    elif duplicate.description and len(duplicate.description) > len(primary.description):
-                        primary.description = duplicate.description
-                    if not primary.objectives and duplicate.objectives:
-                        primary.objectives = duplicate.objectives
-                    elif duplicate.objectives and len(duplicate.objectives) > len(primary.objectives):
-                        primary.objectives = duplicate.objectives
-                    if not primary.methodology and duplicate.methodology:
-                        primary.methodology = duplicate.methodology
-                    elif duplicate.methodology and len(duplicate.methodology) > len(primary.methodology):
-                        primary.methodology = duplicate.methodology
-                    if not primary.algorithm_used and duplicate.algorithm_used:
-                        primary.algorithm_used = duplicate.algorithm_used
-                    if not primary.top_model and duplicate.top_model:
-                        primary.top_model = duplicate.top_model
-                    if not primary.accuracy and duplicate.accuracy:
-                        primary.accuracy = duplicate.accuracy
-                    if not primary.advantages and duplicate.advantages:
-                        primary.advantages = duplicate.advantages
-                    elif duplicate.advantages and len(duplicate.advantages) > len(primary.advantages):
-                        primary.advantages = duplicate.advantages
-                    if not primary.drawbacks and duplicate.drawbacks:
-                        primary.drawbacks = duplicate.drawbacks
-                    elif duplicate.drawbacks and len(duplicate.drawbacks) > len(primary.drawbacks):
-                        primary.drawbacks = duplicate.drawbacks
-                    if not primary.source and duplicate.source:
-                        primary.source = duplicate.source
+                    dirty_fields |= self.merge_fields(primary, duplicate, SCALAR_FIELDS)
                     
                     # Move criteria from duplicate to primary
                     for criterion in duplicate.criteria.all():
                         # Check if primary already has this criterion
-                        existing = Criterion.objects.filter(
-                            framework=primary,
-                            name=criterion.name
-                        ).first()
+                        existing = primary_criteria.get(criterion.name)
                         
                         if existing:
                             # Merge criterion data
-                            if not existing.description and criterion.description:
-                                existing.description = criterion.description
-                            elif criterion.description and len(criterion.description) > len(existing.description):
-                                existing.description = criterion.description
-                            if not existing.category and criterion.category:
-                                existing.category = criterion.category
-                            existing.save()
+                            changed = self.merge_fields(existing, criterion, CRITERION_FIELDS)
+                            if not dry_run and changed:
+                                existing.save(update_fields=[*changed, 'updated_at'])
                             
                             # Move definitions
                             for definition in criterion.definitions.all():
                                 # Check for duplicate definition
-                                if not Definition.objects.filter(
-                                    criterion=existing,
-                                    definition_text=definition.definition_text
-                                ).exists():
+                                if definition.definition_text not in existing_texts[existing.id]:
                                     definition.criterion = existing
-                                    definition.save()
+                                    definition.updated_at = now
+                                    moved_definitions.append(definition)
+                                    existing_texts[existing.id].add(definition.definition_text)
                         else:
                             # Move criterion to primary
                             criterion.framework = primary
-                            criterion.save()
+                            criterion.updated_at = now
+                            moved_criteria.append(criterion)
+                            primary_criteria[criterion.name] = criterion
+                            existing_texts[criterion.id] = {d.definition_text for d in criterion.definitions.all()}
                     
                     if not dry_run:
-                        primary.save()
-                        duplicate.delete()
+                        duplicate_ids.append(duplicate.id)
                     merged_count += 1
+                
+                if not dry_run and dirty_fields:
+                    primary.save(update_fields=[*dirty_fields, 'updated_at'])
+        
+        # Reassign foreign keys before the duplicates (and anything still under them) are deleted
+        if not dry_run:
+            Criterion.objects.bulk_update(moved_criteria, ['framework', 'updated_at'], batch_size=BATCH_SIZE)
+            Definition.objects.bulk_update(moved_definitions, ['criterion', 'updated_at'], batch_size=BATCH_SIZE)
+        self.delete_by_ids(Framework, duplicate_ids)
         
         return merged_count
 
     def cleanup_duplicate_criteria(self, dry_run):
         """Merge duplicate criteria within the same framework"""
         merged_count = 0
+        duplicate_ids = []
         
-        # Group criteria by framework
-        frameworks = Framework.objects.prefetch_related('criteria').all()
+        # Group criteria by framework, with definitions prefetched for the merge
+        frameworks = Framework.objects.prefetch_related('criteria__definitions').all()
         
         for framework in frameworks:
             criteria_groups = {}
             
             for criterion in framework.criteria.all():
-                normalized_name = self.normalize_criterion_name(criterion.name)
+                normalized_name = normalize_criterion_name(criterion.name)
                 if normalized_name not in criteria_groups:
                     criteria_groups[normalized_name] = []
                 criteria_groups[normalized_name].append(criterion)
@@ -206,66 +276,100 @@ class Command(BaseCommand):
                     
                     self.stdout.write(f'  Merging {len(duplicates)} duplicate criteria "{primary.name}" in {framework.name}')
                     
+                    # Texts the primary already has, from the prefetched definitions
+                    existing_texts = {d.definition_text for d in primary.definitions.all()}
+                    moved_definition_ids = []
+                    dirty_fields = set()
+                    
                     for duplicate in duplicates:
                         # Merge data
-                        if not primary.description and duplicate.description:
-                            primary.description = duplicate.description
-                        elif duplicate.description and len(duplicate.description) > len(primary.description):
-                            primary.description = duplicate.description
-                        if not primary.category and duplicate.category:
-                            primary.category = duplicate.category
+                        dirty_fields |= self.merge_fields(primary, duplicate, CRITERION_FIELDS)
                         
                         # Move definitions
                         for definition in duplicate.definitions.all():
-                            if not Definition.objects.filter(
-                                criterion=primary,
-                                definition_text=definition.definition_text
-                            ).exists():
-                                definition.criterion = primary
-                                definition.save()
+                            if definition.definition_text not in existing_texts:
+                                moved_definition_ids.append(definition.id)
+                                existing_texts.add(definition.definition_text)
                         
                         if not dry_run:
-                            primary.save()
-                            duplicate.delete()
+                            duplicate_ids.append(duplicate.id)
                         merged_count += 1
+                    
+                    if not dry_run and dirty_fields:
+                        primary.save(update_fields=[*dirty_fields, 'updated_at'])
+                    
+                    if not dry_run and moved_definition_ids:
+                        Definition.objects.filter(id__in=moved_definition_ids).update(
+                            criterion=primary, updated_at=timezone.now()
+                        )
+        
+        self.delete_by_ids(Criterion, duplicate_ids)
         
         return merged_count
 
-    def cleanup_duplicate_definitions(self, dry_run):
+    def has_fuzzy_match(self, normalized, by_length, lengths, kept, threshold):
+        """
+        Return True if a longer text, or an equal-length text already kept, is at
+        least `threshold` similar to `normalized` by RapidFuzz's ratio.
+        """
+        # ratio <= 200 * shorter / (shorter + longer), so longer texts past this bound can't match
+        max_length = int(len(normalized) * (200 - threshold) / threshold)
+        start = bisect_left(lengths, len(normalized))
+        end = bisect_right(lengths, max_length)
+        candidates = [
+            other for other in by_length[start:end]
+            if other != normalized and (len(other) > len(normalized) or other in kept)
+        ]
+        if not candidates:
+            return False
+        return process.extractOne(normalized, candidates, scorer=fuzz.ratio, score_cutoff=threshold) is not None
+
+    def cleanup_duplicate_definitions(self, dry_run, fuzzy_threshold=None):
         """Remove duplicate definitions"""
         removed_count = 0
+        duplicate_ids = []
         
         criteria = Criterion.objects.prefetch_related('definitions').all()
         
-        for criterion in criteria:
-            definitions = list(criterion.definitions.all())
+        # Stream criteria in chunks; definitions are prefetched per chunk
+        for criterion in criteria.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            # Normalize each text once
+            entries = [
+                (definition, normalize_name(definition.definition_text))
+                for definition in criterion.definitions.all()
+            ]
+            # Distinct normalized texts sorted by length, so the near-duplicate
+            # candidates for a text form one contiguous window
+            by_length = sorted({normalized for _, normalized in entries}, key=len)
+            lengths = [len(normalized) for normalized in by_length]
             seen_normalized = set()
             duplicates_to_remove = []
             
-            for definition in definitions:
-                normalized = self.normalize_name(definition.definition_text)
-                
+            for definition, normalized in entries:
                 if normalized in seen_normalized:
                     duplicates_to_remove.append(definition)
                 else:
                     seen_normalized.add(normalized)
                     
-                    # Also check for near-duplicates (one contains the other)
-                    for other_def in definitions:
-                        if other_def != definition:
-                            other_normalized = self.normalize_name(other_def.definition_text)
-                            if normalized in other_normalized or other_normalized in normalized:
-                                if abs(len(normalized) - len(other_normalized)) < 20:
-                                    # Keep the longer one
-                                    if len(normalized) < len(other_normalized):
-                                        duplicates_to_remove.append(definition)
-                                        break
+                    # Also check for near-duplicates, keeping the longer one
+                    if fuzzy_threshold is not None:
+                        if self.has_fuzzy_match(normalized, by_length, lengths, seen_normalized, fuzzy_threshold):
+                            duplicates_to_remove.append(definition)
+                        continue
+                    
+                    # Without a threshold: drop this one if a text less than
+                    # 20 characters longer contains it
+                    start = bisect_right(lengths, len(normalized))
+                    end = bisect_left(lengths, len(normalized) + 20)
+                    if any(normalized in other for other in by_length[start:end]):
+                        duplicates_to_remove.append(definition)
             
             if duplicates_to_remove:
                 self.stdout.write(f'  Removing {len(duplicates_to_remove)} duplicate definitions for "{criterion.name}"')
                 if not dry_run:
-                    for dup in duplicates_to_remove:
-                        dup.delete()
+                    duplicate_ids.extend(dup.id for dup in duplicates_to_remove)
                 removed_count += len(duplicates_to_remove)
         
+        self.delete_by_ids(Definition, duplicate_ids)
+        
         return removed_count
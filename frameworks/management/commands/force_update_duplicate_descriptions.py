@@ -5,11 +5,20 @@ across different frameworks to make them framework-specific.
 from django.core.management.base import BaseCommand
 from frameworks.models import Criterion
 from frameworks.llm_comparison import LLMComparisonEngine
-from django.db.models import Count
+from django.db import transaction
+from django.utils import timezone
+from django.db.models.functions import Length
 import logging
+from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
+# Descriptions are generated concurrently and written in batches of this many rows
+UPDATE_BATCH_SIZE = 200
+
+# Shared descriptions shorter than this are considered generic
+GENERIC_DESCRIPTION_MAX_LENGTH = 200
+
 
 class Command(BaseCommand):
     help = 'Force update criteria with identical descriptions across frameworks to be framework-specific'
@@ -28,29 +37,35 @@ class Command(BaseCommand):
             self.style.SUCCESS(f'Using LLM provider: {engine.provider}')
         )
         
+        if transaction.get_connection().in_atomic_block:
+            self.stdout.write(
+                self.style.WARNING('Running inside a transaction: locks will be held across LLM calls until it commits')
+            )
+        
         # Find criteria with identical descriptions across frameworks
         self.stdout.write('\nFinding criteria with duplicate descriptions...')
-        duplicate_descriptions = Criterion.objects.values('name', 'description').annotate(
-            count=Count('id')
+        # Only short descriptions are treated as generic (not framework-specific),
+        # so longer ones are filtered out in the database. The rest are loaded in
+        # one query and grouped here by (name, description).
+        candidates = Criterion.objects.annotate(
+            description_length=Length('description')
         ).filter(
-            count__gt=1,
-            description__isnull=False
-        ).exclude(description='')
-        
-        total_to_update = 0
-        criteria_to_update = []
-        
-        for dup in duplicate_descriptions:
-            criteria = Criterion.objects.filter(
-                name=dup['name'],
-                description=dup['description']
-            ).select_related('framework').prefetch_related('definitions')
-            
-            # Only update if description is generic (not framework-specific)
-            if len(dup['description']) < 200:  # Generic descriptions are usually shorter
-                for criterion in criteria:
-                    criteria_to_update.append(criterion)
-                    total_to_update += 1
+            description__isnull=False,
+            description_length__lt=GENERIC_DESCRIPTION_MAX_LENGTH
+        ).exclude(description='').select_related('framework').only(
+            'id', 'name', 'description', 'category', 'framework__name', 'framework__year'
+        ).prefetch_related('definitions')
+        
+        groups = defaultdict(list)
+        for criterion in candidates:
+            groups[(criterion.name, criterion.description)].append(criterion)
+        
+        criteria_to_update = [
+            criterion
+            for criteria in groups.values() if len(criteria) > 1
+            for criterion in criteria
+        ]
+        total_to_update = len(criteria_to_update)
         
         self.stdout.write(f'Found {total_to_update} criteria with duplicate/generic descriptions to update')
         
@@ -60,6 +75,8 @@ class Command(BaseCommand):
         
         updated_count = 0
         error_count = 0
+        # Criteria with a new description, not yet written to the database
+        pending = []
         
         # Group by criterion name for context
         criteria_by_name = {}
@@ -69,76 +86,53 @@ class Command(BaseCommand):
                 criteria_by_name[name] = []
             criteria_by_name[name].append(criterion)
         
-        for idx, criterion in enumerate(criteria_to_update, 1):
-            criterion_name = criterion.name.strip()
-            framework = criterion.framework
-            
-            self.stdout.write(f'\n[{idx}/{total_to_update}] Updating: {criterion_name} in {framework.name}')
-            
-            # Get context from other frameworks with same criterion
-            other_frameworks_data = []
-            if criterion_name in criteria_by_name:
-                for other_criterion in criteria_by_name[criterion_name]:
-                    if other_criterion.id != criterion.id:
-                        other_desc = other_criterion.description.strip() if other_criterion.description else ''
-                        if other_desc:
-                            other_frameworks_data.append({
-                                'framework_name': other_criterion.framework.name,
-                                'description': other_desc[:150]
-                            })
-            
-            # Get definitions
-            definitions = [d.definition_text.strip() for d in criterion.definitions.all() if d.definition_text.strip()]
-            
-            # Build framework data
-            fw_data = {
-                'has_criterion': True,
-                'description': criterion.description or '',
-                'category': criterion.category or '',
-                'definitions': definitions[:3]
-            }
-            
-            # Get all framework data for context
-            all_framework_data = []
-            if criterion_name in criteria_by_name:
-                for other_criterion in criteria_by_name[criterion_name]:
-                    if other_criterion.id != criterion.id:
-                        other_defs = [d.definition_text.strip() for d in other_criterion.definitions.all() if d.definition_text.strip()]
-                        all_framework_data.append({
-                            'has_criterion': True,
-                            'description': other_criterion.description.strip() if other_criterion.description else '',
-                            'category': other_criterion.category or '',
-                            'definitions': other_defs[:2]
-                        })
-            
-            try:
-                # Generate enhanced description
-                enhanced_desc = engine.generate_enhanced_description(
-                    criterion_name,
-                    fw_data,
-                    framework,
-                    all_framework_data
-                )
+        # Stripped definition texts per criterion, read once from the prefetch
+        definitions_by_id = {
+            criterion.id: [text for text in (d.definition_text.strip() for d in criterion.definitions.all()) if text]
+            for criterion in criteria_to_update
+        }
+        
+        # Each batch of criteria is sent to the LLM concurrently (bounded and rate
+        # limited by the engine), then written in one bulk update. Descriptions
+        # already generated are written even if the run is interrupted.
+        try:
+            for start in range(0, total_to_update, UPDATE_BATCH_SIZE):
+                batch = criteria_to_update[start:start + UPDATE_BATCH_SIZE]
+                requests = [
+                    self.build_request(criterion, criteria_by_name, definitions_by_id)
+                    for criterion in batch
+                ]
+                results = engine.generate_enhanced_descriptions_concurrently(requests)
                 
-                if enhanced_desc and len(enhanced_desc.strip()) > 30:
-                    criterion.description = enhanced_desc.strip()
-                    criterion.save()
-                    self.stdout.write(
-                        self.style.SUCCESS(f'  ✓ Updated: {enhanced_desc[:80]}...')
-                    )
-                    updated_count += 1
-                else:
-                    self.stdout.write(
-                        self.style.WARNING(f'  → No valid description generated')
-                    )
-                    error_count += 1
+                for idx, (criterion, enhanced_desc) in enumerate(zip(batch, results), start + 1):
+                    criterion_name = criterion.name.strip()
+                    framework = criterion.framework
                     
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f'  ✗ Error: {str(e)}')
-                )
-                logger.error(f'Error updating {criterion_name} in {framework.name}: {e}', exc_info=True)
+                    self.stdout.write(f'\n[{idx}/{total_to_update}] Updating: {criterion_name} in {framework.name}')
+                    
+                    if isinstance(enhanced_desc, Exception):
+                        error_count += 1
+                        self.stdout.write(
+                            self.style.ERROR(f'  ✗ Error: {str(enhanced_desc)}')
+                        )
+                        logger.error(f'Error updating {criterion_name} in {framework.name}: {enhanced_desc}', exc_info=enhanced_desc)
+                    elif enhanced_desc and len(enhanced_desc.strip()) > 30:
+                        criterion.description = enhanced_desc.strip()
+                        criterion.updated_at = timezone.now()
+                        pending.append(criterion)
+                        self.stdout.write(
+                            self.style.SUCCESS(f'  ✓ Updated: {enhanced_desc[:80]}...')
+                        )
+                        updated_count += 1
+                    else:
+                        self.stdout.write(
+                            self.style.WARNING(f'  → No valid description generated')
+                        )
+                        error_count += 1
+                
+                self.flush_updates(pending)
+        finally:
+            self.flush_updates(pending)
         
         # Summary
         self.stdout.write('\n' + '='*60)
@@ -147,3 +141,37 @@ class Command(BaseCommand):
                 f'\nCompleted! Updated: {updated_count}, Errors: {error_count}'
             )
         )
+
+    def build_request(self, criterion, criteria_by_name, definitions_by_id):
+        """Arguments for engine.generate_enhanced_description() for one criterion"""
+        criterion_name = criterion.name.strip()
+        
+        # Build framework data
+        fw_data = {
+            'has_criterion': True,
+            'description': criterion.description or '',
+            'category': criterion.category or '',
+            'definitions': definitions_by_id[criterion.id][:3]
+        }
+        
+        # Get all framework data for context
+        all_framework_data = []
+        for other_criterion in criteria_by_name.get(criterion_name, []):
+            if other_criterion.id != criterion.id:
+                all_framework_data.append({
+                    'has_criterion': True,
+                    'description': other_criterion.description.strip() if other_criterion.description else '',
+                    'category': other_criterion.category or '',
+                    'definitions': definitions_by_id[other_criterion.id][:2]
+                })
+        
+        return criterion_name, fw_data, criterion.framework, all_framework_data
+
+    def flush_updates(self, pending):
+        """Write the pending descriptions in one UPDATE per batch and clear the list"""
+        if not pending:
+            return
+        # Only this short write runs in a transaction; LLM calls happen outside it
+        with transaction.atomic():
+            Criterion.objects.bulk_update(pending, ['description', 'updated_at'])
+        pending.clear()
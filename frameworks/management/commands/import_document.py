@@ -4,33 +4,260 @@ Management command to import Knowledge Graph quality frameworks data from Word d
 Usage:
     python manage.py import_document path/to/document.docx
     python manage.py import_document path/to/document.pdf
+    python manage.py import_document path/to/document.pdf --parser pdfplumber
 
 The document should contain tables or structured data with framework information.
 Supports both .docx and .pdf formats.
 """
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+import importlib
+import io
 import os
 import re
-from frameworks.models import Framework, Criterion, Definition
+from frameworks.models import Framework, Criterion, Definition, normalize_name
+from frameworks.pdf_pages import extract_page, extract_worker_page, init_worker, page_batch_size
 
 try:
-    from docx import Document
-    DOCX_AVAILABLE = True
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
 except ImportError:
-    DOCX_AVAILABLE = False
+    AHOCORASICK_AVAILABLE = False
 
-try:
-    import pdfplumber
-    PDFPLUMBER_AVAILABLE = True
-except ImportError:
-    PDFPLUMBER_AVAILABLE = False
+# The document parsers are imported on first use, so --help and runs on one
+# format never load the other format's libraries
+_OPTIONAL_MODULES = {}
 
-try:
-    import PyPDF2
-    PYPDF2_AVAILABLE = True
-except ImportError:
-    PYPDF2_AVAILABLE = False
+
+def _lazy_import(module_name, attr=None):
+    """Import an optional dependency once; returns None if it is not installed"""
+    if module_name not in _OPTIONAL_MODULES:
+        try:
+            _OPTIONAL_MODULES[module_name] = importlib.import_module(module_name)
+        except ImportError:
+            _OPTIONAL_MODULES[module_name] = None
+    module = _OPTIONAL_MODULES[module_name]
+    if module is None or attr is None:
+        return module
+    return getattr(module, attr)
+
+
+# Relationship id attribute of a w:hyperlink element
+_RID_ATTR = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+
+@lru_cache(maxsize=None)
+def _cell_hyperlinks_xpath():
+    """Compiled XPath for the w:hyperlink elements in a table cell's own paragraphs"""
+    from lxml import etree
+    return etree.XPath(
+        './w:p/w:hyperlink | ./w:p/w:r//w:hyperlink',
+        namespaces={'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'},
+    )
+
+
+@lru_cache(maxsize=None)
+def _docx_document_class():
+    """
+    python-docx's Document, or None if it is not installed. Its part parser is
+    swapped once for one that accepts very large document.xml files and
+    doesn't keep an id lookup table for the whole tree.
+    """
+    Document = _lazy_import('docx', 'Document')
+    if Document is not None:
+        from lxml import etree
+        oxml = _lazy_import('docx.oxml.parser')
+        parser = etree.XMLParser(remove_blank_text=True, resolve_entities=False, collect_ids=False, huge_tree=True)
+        parser.set_element_class_lookup(oxml.element_class_lookup)
+        oxml.oxml_parser = parser
+    return Document
+
+
+# Quality dimensions recognised by name in free text. DOCX paragraphs only look
+# for the first group; PDF text also knows the extra ones.
+DOCX_CRITERIA = (
+    'Completeness', 'Accuracy', 'Consistency', 'Conciseness', 'Timeliness',
+    'Relevancy', 'Interoperability', 'Availability', 'Usability',
+)
+TEXT_CRITERIA = DOCX_CRITERIA + ('Correctness', 'Currency', 'Coverage')
+
+# re.IGNORECASE also lets the Turkish dotted and dotless I match 'i', which
+# casefold() alone would not map to 'i'
+_FOLD_TABLE = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+
+
+def fold_case(text):
+    """Case-fold text so that a substring test agrees with the IGNORECASE vocabulary regexes"""
+    return text.translate(_FOLD_TABLE).casefold()
+
+
+# Folded names per vocabulary, for membership tests instead of regex alternation
+_FOLDED_VOCABULARIES = {
+    vocabulary: frozenset(fold_case(name) for name in vocabulary)
+    for vocabulary in (DOCX_CRITERIA, TEXT_CRITERIA)
+}
+
+
+def _build_criteria_automaton():
+    """Aho-Corasick automaton over the folded vocabulary, or None without pyahocorasick"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    for name in _FOLDED_VOCABULARIES[TEXT_CRITERIA]:
+        automaton.add_word(name, name)
+    automaton.make_automaton()
+    return automaton
+
+
+_CRITERIA_AUTOMATON = _build_criteria_automaton()
+
+
+def mentions_criterion(text, vocabulary):
+    """
+    Cheap pre-check for the vocabulary regexes: False only if no name from
+    `vocabulary` occurs in text (case-insensitively). One Aho-Corasick scan
+    with pyahocorasick, otherwise a substring test per name; either way the
+    regexes still decide the actual match.
+    """
+    folded = fold_case(text)
+    names = _FOLDED_VOCABULARIES[vocabulary]
+    if _CRITERIA_AUTOMATON is None:
+        return any(name in folded for name in names)
+    return any(name in names for _, name in _CRITERIA_AUTOMATON.iter(folded))
+
+
+# Patterns are compiled once here rather than looked up per line or row
+_DOCX_FRAMEWORK_RE = re.compile(r'([A-Z][a-z]+(?:\s+et\s+al\.)?)\s*(\d{4})?', re.IGNORECASE)
+_DOCX_CRITERION_RES = (
+    re.compile(f"({'|'.join(DOCX_CRITERIA)})", re.IGNORECASE),
+    re.compile(r'Criterion[:\s]+([A-Z][a-z]+)', re.IGNORECASE),
+)
+
+# Pattern: "Author et al. (Year)" or "Author (Year)" or "Framework Name"
+# A leading "Name Name 2016" header is always found by the first pattern
+# already, on its last name, so it needs no pattern of its own
+_TEXT_FRAMEWORK_RES = (
+    re.compile(r'([A-Z][a-z]+(?:\s+et\s+al\.)?)\s*\(?(\d{4})\)?', re.IGNORECASE),
+    re.compile(r'Framework[:\s]+([A-Z][^\(]+)', re.IGNORECASE),
+)
+_TEXT_CRITERION_RES = (
+    re.compile(f"^\\s*[-•]\\s*({'|'.join(TEXT_CRITERIA)})", re.IGNORECASE),
+    re.compile(f"({'|'.join(TEXT_CRITERIA)})[:\\s]+", re.IGNORECASE),
+    re.compile(r'Criterion[:\s]+([A-Z][a-z]+)', re.IGNORECASE),
+    re.compile(r'^\s*\d+\.\s*([A-Z][a-z]+)', re.IGNORECASE),
+)
+
+_YEAR_RE = re.compile(r'(\d{4})')
+_PAREN_YEAR_RE = re.compile(r'\((\d{4})\)')
+_YEAR_STRIP_RE = re.compile(r'\s*\(?\d{4}\)?')
+_AUTHOR_RE = re.compile(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+et\s+al\.)?)')
+_TITLE_SPLIT_RE = re.compile(r'[:\-–]')
+_DIMENSION_SEPARATOR_RE = re.compile(r'[,;]+')
+_DIMENSION_PREFIX_RE = re.compile(r'^(Syntactic|Semantic|Representational)[\s-]+', re.IGNORECASE)
+_NON_DIMENSION_WORDS = frozenset({'n/a', 'na', 'read', 'and', 'or', 'the', 'none', 'null'})
+
+
+def _dimension_key(dim):
+    """Letters only, lowercased: 'Time-liness', 'TIMELINESS' and 'timeliness' share a key"""
+    return ''.join(c for c in dim.lower() if c.isalpha())
+
+
+# Known quality dimensions by key, so spelling variants collapse onto one name
+_DIMENSION_CANONICAL = {_dimension_key(name): name for name in TEXT_CRITERIA}
+
+
+@lru_cache(maxsize=4096)
+def extract_year(text, pattern):
+    """The year captured by `pattern` in text, or None; cached per distinct string"""
+    match = pattern.search(text)
+    if match:
+        try:
+            return int(match.group(1))
+        except ValueError:
+            pass
+    return None
+
+
+@lru_cache(maxsize=4096)
+def authors_from_title(title):
+    """
+    Authors leading a title, as in "Author et al. - Title" or "Author: Title",
+    or '' if the title doesn't start with what looks like an author name
+    """
+    title_clean = _YEAR_STRIP_RE.sub('', title)
+    
+    # Check if title starts with what looks like an author name (short, capitalized words)
+    first_part = _TITLE_SPLIT_RE.split(title_clean, 1)[0].strip()
+    words = first_part.split()
+    # If first part is short (likely author) and starts with a capital, use it
+    if len(words) <= 4 and len(first_part) < 50 and first_part[:1].isupper():
+        # Check if it looks like an author name (second word capitalized too)
+        if len(words) < 2 or words[1][0].isupper():
+            return first_part
+    return ''
+
+
+@lru_cache(maxsize=4096)
+def clean_dimension(item):
+    """
+    Turn one item of a table's dimensions cell into a criterion name, or None
+    if it is not a dimension. Cached, since the same items recur across rows.
+    """
+    # Collapse whitespace and newlines within the item
+    dim = ' '.join(item.split())
+    # Filter out very short strings and common non-dimension words
+    if len(dim) <= 2 or dim.lower() in _NON_DIMENSION_WORDS:
+        return None
+    # Clean up common prefixes that might be split across lines
+    dim = _DIMENSION_PREFIX_RE.sub('', dim)
+    # Remove trailing periods, dashes, and parentheses
+    dim = dim.rstrip('.-()[]').strip()
+    # Skip if it's just a single letter, number, or common words
+    if len(dim) <= 2 or dim.replace(' ', '').isdecimal():
+        return None
+    canonical = _DIMENSION_CANONICAL.get(_dimension_key(dim))
+    if canonical:
+        return canonical
+    # Capitalize first letter
+    return dim[0].upper() + dim[1:]
+
+# --parser auto: pdfplumber is slow but finds tables, so it is only used for
+# short PDFs, or mid-sized ones whose first page looks tabular. Everything
+# else is read as plain text with PyPDF2.
+PDF_PARSERS = ('auto', 'pdfplumber', 'pypdf2')
+PDF_SMALL_PAGE_COUNT = 10
+PDF_LARGE_PAGE_COUNT = 200
+_TABLE_LIKE_RE = re.compile(r'\|| {3,}')
+
+# Table header substring -> column, tried in order; the first hit names the column.
+# 'topmodel' is looked for with spaces removed, so "Top Model" counts too.
+_HEADER_COLUMNS = {
+    'title': 'title',
+    'year': 'year',
+    'published': 'year',
+    'dimension': 'dimensions',
+    'abstract': 'abstract',
+    'objective': 'objectives',
+    'methodology': 'methodology',
+    'algorithm': 'algorithm',
+    'topmodel': 'top_model',
+    'accuracy': 'accuracy',
+    'advantage': 'advantages',
+    'drawback': 'drawbacks',
+    'reference': 'reference',
+}
+_COMPACT_HEADER_KEYS = frozenset({'topmodel'})
+
+# Read buffer for the document file; PDF parsers seek and read it many times
+FILE_BUFFER_SIZE = 1 << 20
+
+# Rows per INSERT/UPDATE statement when writing frameworks in bulk
+BATCH_SIZE = 500
 
 
 class Command(BaseCommand):
@@ -43,57 +270,58 @@ class Command(BaseCommand):
             action='store_true',
             help='Run without actually saving data to database',
         )
+        parser.add_argument(
+            '--parser',
+            choices=PDF_PARSERS,
+            default='auto',
+            help='PDF parser to use (default: auto, picked from the page count)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=max(1, (os.cpu_count() or 1) // 2),
+            help='Processes used to extract PDF pages with pdfplumber (default: half the CPUs)',
+        )
+        parser.add_argument(
+            '--skip-tables',
+            action='store_true',
+            help='Do not look for tables; read only the text (for documents known to have no tables)',
+        )
 
-    def detect_file_type(self, file_path):
-        """Detect the actual file type by reading file header"""
+    def detect_file_type(self, document_file):
+        """Detect the actual file type by reading the header of an open file, then rewind it"""
         try:
-            with open(file_path, 'rb') as f:
-                header = f.read(8)
-                # DOCX files start with PK (ZIP signature)
-                if header.startswith(b'PK'):
-                    return 'docx'
-                # PDF files start with %PDF
-                elif header.startswith(b'%PDF'):
-                    return 'pdf'
-        except:
+            header = document_file.read(8)
+            document_file.seek(0)
+            # DOCX files start with PK (ZIP signature)
+            if header.startswith(b'PK'):
+                return 'docx'
+            # PDF files start with %PDF
+            elif header.startswith(b'%PDF'):
+                return 'pdf'
+        except OSError:
             pass
         return None
 
     def handle(self, *args, **options):
         document_path = options['document_file']
         dry_run = options['dry_run']
+        pdf_parser = options['parser']
+        workers = options['workers']
+        skip_tables = options['skip_tables']
+
+        if workers < 1:
+            raise CommandError('--workers must be at least 1')
 
         if not os.path.exists(document_path):
             raise CommandError(f'File not found: {document_path}')
 
         file_ext = os.path.splitext(document_path)[1].lower()
         
-        # Detect actual file type (in case file extension doesn't match)
-        actual_type = self.detect_file_type(document_path)
-        
         try:
-            if file_ext == '.docx' or actual_type == 'docx':
-                if not DOCX_AVAILABLE:
-                    raise CommandError('python-docx is not installed. Install it with: pip install python-docx')
-                doc = Document(document_path)
-                self.stdout.write(self.style.SUCCESS(f'Opened DOCX document: {document_path}'))
-                frameworks_data = self.parse_docx(doc)
-            elif file_ext == '.pdf' or actual_type == 'pdf':
-                if not PDFPLUMBER_AVAILABLE and not PYPDF2_AVAILABLE:
-                    raise CommandError('PDF library is not installed. Install with: pip install pdfplumber PyPDF2')
-                self.stdout.write(self.style.SUCCESS(f'Opened PDF document: {document_path}'))
-                frameworks_data = self.parse_pdf(document_path)
-            else:
-                # Try DOCX first if extension is unknown
-                if DOCX_AVAILABLE:
-                    try:
-                        doc = Document(document_path)
-                        self.stdout.write(self.style.SUCCESS(f'Detected DOCX format: {document_path}'))
-                        frameworks_data = self.parse_docx(doc)
-                    except:
-                        raise CommandError(f'Unsupported file format: {file_ext}. Supported formats: .docx, .pdf')
-                else:
-                    raise CommandError(f'Unsupported file format: {file_ext}. Supported formats: .docx, .pdf')
+            # One buffered handle serves the type sniffing and whichever parser reads the file
+            with open(document_path, 'rb', buffering=FILE_BUFFER_SIZE) as document_file:
+                frameworks_data = self.parse_document(document_file, file_ext, pdf_parser, workers, skip_tables)
             
             if dry_run:
                 self.stdout.write(self.style.WARNING('DRY RUN MODE - No data will be saved'))
@@ -114,21 +342,62 @@ class Command(BaseCommand):
         except Exception as e:
             raise CommandError(f'Error importing document: {str(e)}')
 
-    def parse_docx(self, doc):
-        """Parse DOCX document to extract framework data"""
+    def parse_document(self, document_file, file_ext, pdf_parser, workers, skip_tables=False):
+        """Pick the parser from the extension or the file header and return the framework data"""
+        # Detect actual file type (in case file extension doesn't match)
+        actual_type = self.detect_file_type(document_file)
+        
+        if file_ext == '.docx' or actual_type == 'docx':
+            Document = _docx_document_class()
+            if Document is None:
+                raise CommandError('python-docx is not installed. Install it with: pip install python-docx')
+            doc = Document(document_file)
+            self.stdout.write(self.style.SUCCESS(f'Opened DOCX document: {document_file.name}'))
+            frameworks_data = self.parse_docx(doc, skip_tables)
+        elif file_ext == '.pdf' or actual_type == 'pdf':
+            pdfplumber = _lazy_import('pdfplumber')
+            PyPDF2 = _lazy_import('PyPDF2')
+            if pdfplumber is None and PyPDF2 is None:
+                raise CommandError('PDF library is not installed. Install with: pip install pdfplumber PyPDF2')
+            if pdf_parser == 'pdfplumber' and pdfplumber is None:
+                raise CommandError('pdfplumber is not installed. Install it with: pip install pdfplumber')
+            if pdf_parser == 'pypdf2' and PyPDF2 is None:
+                raise CommandError('PyPDF2 is not installed. Install it with: pip install PyPDF2')
+            self.stdout.write(self.style.SUCCESS(f'Opened PDF document: {document_file.name}'))
+            frameworks_data = self.parse_pdf(document_file, pdf_parser, workers, skip_tables)
+        else:
+            # Try DOCX first if extension is unknown
+            Document = _docx_document_class()
+            if Document is not None:
+                try:
+                    doc = Document(document_file)
+                    self.stdout.write(self.style.SUCCESS(f'Detected DOCX format: {document_file.name}'))
+                    frameworks_data = self.parse_docx(doc, skip_tables)
+                except:
+                    raise CommandError(f'Unsupported file format: {file_ext}. Supported formats: .docx, .pdf')
+            else:
+                raise CommandError(f'Unsupported file format: {file_ext}. Supported formats: .docx, .pdf')
+        
+        return frameworks_data
+
+    def parse_docx(self, doc, skip_tables=False):
+        """Parse DOCX document to extract framework data; skip_tables reads only the paragraphs"""
         frameworks_data = []
         
         # Store document reference for hyperlink extraction
         self.doc = doc
+        # Relationship targets by id, looked up for each hyperlink in a table cell
+        self.rel_targets = {r_id: rel.target_ref for r_id, rel in doc.part.rels.items()}
         
         # Parse tables first (more reliable for structured data)
         # This document uses tables, so we prioritize table parsing
-        for table in doc.tables:
+        tables = [] if skip_tables else doc.tables
+        for table in tables:
             frameworks_from_table = self.parse_table(table)
             frameworks_data.extend(frameworks_from_table)
         
         # Only parse paragraphs if no tables found
-        if not doc.tables:
+        if not tables:
             current_framework = None
             
             for para in doc.paragraphs:
@@ -141,7 +410,7 @@ class Command(BaseCommand):
                     continue
                 
                 # Try to detect framework headers
-                framework_match = re.search(r'([A-Z][a-z]+(?:\s+et\s+al\.)?)\s*(\d{4})?', text, re.IGNORECASE)
+                framework_match = _DOCX_FRAMEWORK_RE.search(text)
                 if framework_match:
                     if current_framework:
                         frameworks_data.append(current_framework)
@@ -159,14 +428,10 @@ class Command(BaseCommand):
                         'criteria': [],
                     }
                 elif current_framework:
-                    # Try to detect criteria
-                    criterion_patterns = [
-                        r'(Completeness|Accuracy|Consistency|Conciseness|Timeliness|Relevancy|Interoperability|Availability|Usability)',
-                        r'Criterion[:\s]+([A-Z][a-z]+)',
-                    ]
-                    
-                    for pattern in criterion_patterns:
-                        match = re.search(pattern, text, re.IGNORECASE)
+                    # Try to detect criteria; the vocabulary regex only runs when a name occurs
+                    patterns = _DOCX_CRITERION_RES if mentions_criterion(text, DOCX_CRITERIA) else _DOCX_CRITERION_RES[1:]
+                    for pattern in patterns:
+                        match = pattern.search(text)
                         if match:
                             criterion_name = match.group(1) if match.groups() else match.group(0)
                             current_framework['criteria'].append({
@@ -182,89 +447,130 @@ class Command(BaseCommand):
         
         return frameworks_data
 
-    def parse_pdf(self, pdf_path):
-        """Parse PDF document to extract framework data"""
+    def choose_pdf_parser(self, pdf_file):
+        """Pick pdfplumber or PyPDF2 for an open PDF from its page count and a first-page sample"""
+        PyPDF2 = _lazy_import('PyPDF2')
+        if PyPDF2 is None:
+            return 'pdfplumber'
+        if _lazy_import('pdfplumber') is None:
+            return 'pypdf2'
+        
+        try:
+            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            page_count = len(pdf_reader.pages)
+            if page_count <= PDF_SMALL_PAGE_COUNT:
+                return 'pdfplumber'
+            if page_count <= PDF_LARGE_PAGE_COUNT:
+                sample = pdf_reader.pages[0].extract_text() or ''
+                if _TABLE_LIKE_RE.search(sample):
+                    return 'pdfplumber'
+        except Exception:
+            # Let pdfplumber (and its PyPDF2 fallback) deal with unusual files
+            return 'pdfplumber'
+        finally:
+            pdf_file.seek(0)
+        
+        self.stdout.write(f'Large PDF ({page_count} pages): reading text with PyPDF2, tables are not extracted')
+        return 'pypdf2'
+
+    def parse_pdf(self, pdf_file, parser='auto', workers=1, skip_tables=False):
+        """Parse a PDF document, opened in binary mode, to extract framework data"""
         frameworks_data = []
+        pdfplumber = _lazy_import('pdfplumber')
+        PyPDF2 = _lazy_import('PyPDF2')
+        
+        if parser == 'auto':
+            parser = self.choose_pdf_parser(pdf_file)
         
-        # Try pdfplumber first (better for tables)
-        if PDFPLUMBER_AVAILABLE:
+        # pdfplumber is better for tables; PyPDF2 is the fallback
+        if parser == 'pdfplumber' and pdfplumber is not None:
             try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    all_text = []
-                    tables_data = []
-                    
-                    for page in pdf.pages:
-                        # Extract text
-                        text = page.extract_text()
-                        if text:
-                            all_text.append(text)
-                        
-                        # Extract tables
-                        tables = page.extract_tables()
-                        if tables:
-                            tables_data.extend(tables)
-                    
-                    # Parse text content
-                    full_text = '\n'.join(all_text)
-                    frameworks_from_text = self.parse_text_content(full_text)
+                with pdfplumber.open(pdf_file) as pdf:
+                    # Tables are parsed page by page while the text streams through,
+                    # but still reported after the text frameworks
+                    table_frameworks = []
+                    pages = self.iter_pdfplumber_pages(pdf, pdf_file.name, workers, skip_tables)
+                    frameworks_from_text = self.parse_text_content(
+                        self.iter_pdfplumber_lines(pages, table_frameworks)
+                    )
                     frameworks_data.extend(frameworks_from_text)
-                    
-                    # Parse tables
-                    for table in tables_data:
-                        frameworks_from_table = self.parse_pdf_table(table)
-                        frameworks_data.extend(frameworks_from_table)
+                    frameworks_data.extend(table_frameworks)
                     
                     return frameworks_data
             except Exception as e:
                 self.stdout.write(self.style.WARNING(f'pdfplumber parsing failed: {e}, trying PyPDF2'))
         
         # Fallback to PyPDF2
-        if PYPDF2_AVAILABLE:
+        if PyPDF2 is not None:
             try:
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    all_text = []
-                    
-                    for page_num, page in enumerate(pdf_reader.pages):
-                        try:
-                            text = page.extract_text()
-                            if text:
-                                all_text.append(text)
-                        except Exception as e:
-                            self.stdout.write(self.style.WARNING(f'Error extracting text from page {page_num + 1}: {e}'))
-                            continue
-                    
-                    full_text = '\n'.join(all_text)
-                    if not full_text.strip():
-                        raise CommandError('No text could be extracted from PDF. The PDF might be image-based or corrupted.')
-                    frameworks_data = self.parse_text_content(full_text)
-                    return frameworks_data
+                pdf_file.seek(0)
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
+                extracted = {'text': False}
+                frameworks_data = self.parse_text_content(self.iter_pypdf2_lines(pdf_reader, extracted))
+                if not extracted['text']:
+                    raise CommandError('No text could be extracted from PDF. The PDF might be image-based or corrupted.')
+                return frameworks_data
             except Exception as e:
                 raise CommandError(f'Failed to parse PDF with PyPDF2: {e}')
         
         raise CommandError('No PDF parsing library available')
 
-    def parse_text_content(self, text):
-        """Parse text content to extract framework data"""
+    def iter_pdfplumber_pages(self, pdf, pdf_path, workers, skip_tables=False):
+        """
+        Yield (text, tables) for every page in order. Short documents are read
+        in this process; longer ones are spread over worker processes that
+        each open the PDF once.
+        """
+        page_count = len(pdf.pages)
+        if workers <= 1 or page_count <= PDF_SMALL_PAGE_COUNT:
+            for page in pdf.pages:
+                yield extract_page(page, skip_tables)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(pdf_path, skip_tables)) as executor:
+            # map() keeps page order
+            yield from executor.map(extract_worker_page, range(page_count), chunksize=page_batch_size(page_count))
+
+    def iter_pdfplumber_lines(self, pages, table_frameworks):
+        """Yield text lines page by page, parsing each page's tables into table_frameworks"""
+        for text, tables in pages:
+            if text:
+                yield from text.split('\n')
+            
+            for table in tables or []:
+                table_frameworks.extend(self.parse_pdf_table(table))
+
+    def iter_pypdf2_lines(self, pdf_reader, extracted):
+        """Yield text lines one page at a time; sets extracted['text'] once any text is found"""
+        for page_num, page in enumerate(pdf_reader.pages):
+            try:
+                text = page.extract_text()
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'Error extracting text from page {page_num + 1}: {e}'))
+                continue
+            if text:
+                if text.strip():
+                    extracted['text'] = True
+                yield from text.split('\n')
+
+    def parse_text_content(self, lines):
+        """Parse text content, given as a string or an iterable of lines, to extract framework data"""
         frameworks_data = []
         current_framework = None
-        lines = text.split('\n')
+        if isinstance(lines, str):
+            # Walk the text line by line instead of splitting it into a list
+            lines = io.StringIO(lines)
         
         for line in lines:
             line = line.strip()
             if not line:
                 continue
             
-            # Try to detect framework headers
-            # Pattern: "Author et al. (Year)" or "Author (Year)" or "Framework Name"
-            framework_patterns = [
-                r'([A-Z][a-z]+(?:\s+et\s+al\.)?)\s*\(?(\d{4})\)?',
-                r'Framework[:\s]+([A-Z][^\(]+)',
-                r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(\d{4})',
-            ]
-            
-            for pattern in framework_patterns:
-                match = re.search(pattern, line, re.IGNORECASE)
+            # Try to detect framework headers; the "Framework:" pattern only
+            # runs when the word occurs in the line
+            patterns = _TEXT_FRAMEWORK_RES if 'framework' in fold_case(line) else _TEXT_FRAMEWORK_RES[:1]
+            for pattern in patterns:
+                match = pattern.search(line)
                 if match:
                     if current_framework:
                         frameworks_data.append(current_framework)
@@ -285,15 +591,10 @@ class Command(BaseCommand):
             
             # Try to detect criteria
             if current_framework:
-                criterion_patterns = [
-                    r'^\s*[-•]\s*(Completeness|Accuracy|Consistency|Conciseness|Timeliness|Relevancy|Interoperability|Availability|Usability|Correctness|Currency|Coverage)',
-                    r'(Completeness|Accuracy|Consistency|Conciseness|Timeliness|Relevancy|Interoperability|Availability|Usability|Correctness|Currency|Coverage)[:\s]+',
-                    r'Criterion[:\s]+([A-Z][a-z]+)',
-                    r'^\s*\d+\.\s*([A-Z][a-z]+)',
-                ]
-                
-                for pattern in criterion_patterns:
-                    match = re.search(pattern, line, re.IGNORECASE)
+                # The two vocabulary regexes only run when a name occurs in the line
+                patterns = _TEXT_CRITERION_RES if mentions_criterion(line, TEXT_CRITERIA) else _TEXT_CRITERION_RES[2:]
+                for pattern in patterns:
+                    match = pattern.search(line)
                     if match:
                         criterion_name = match.group(1) if match.groups() else match.group(0)
                         # Get description (rest of the line or next lines)
@@ -323,10 +624,10 @@ class Command(BaseCommand):
         header_row = table[0] if len(table) > 0 else []
         headers = [str(cell).strip() if cell else '' for cell in header_row]
         
-        # Look for common column names
-        framework_col = None
-        criterion_col = None
-        definition_col = None
+        # Look for common column names; -1 reads the blank cell appended to every row
+        framework_col = -1
+        criterion_col = -1
+        definition_col = -1
         
         for i, header in enumerate(headers):
             header_lower = str(header).lower()
@@ -336,6 +637,7 @@ class Command(BaseCommand):
                 criterion_col = i
             elif 'definition' in header_lower or 'description' in header_lower:
                 definition_col = i
+        width = max(framework_col, criterion_col, definition_col) + 1
         
         # Group rows by framework
         current_framework = None
@@ -344,30 +646,31 @@ class Command(BaseCommand):
                 continue
             
             cells = [str(cell).strip() if cell else '' for cell in row]
+            cells.extend([''] * (width - len(cells)))
+            cells.append('')
             
-            if framework_col is not None and framework_col < len(cells):
-                framework_name = cells[framework_col]
-                if framework_name:
-                    if current_framework:
-                        frameworks_data.append(current_framework)
-                    
-                    # Extract year from framework name if present
-                    year_match = re.search(r'(\d{4})', framework_name)
-                    year = int(year_match.group(1)) if year_match else None
-                    
-                    current_framework = {
-                        'name': framework_name,
-                        'authors': framework_name.split()[0] if framework_name else '',
-                        'year': year,
-                        'title': '',
-                        'description': '',
-                        'source': '',
-                        'criteria': [],
-                    }
+            framework_name = cells[framework_col]
+            if framework_name:
+                if current_framework:
+                    frameworks_data.append(current_framework)
+                
+                # Extract year from framework name if present
+                year_match = _YEAR_RE.search(framework_name)
+                year = int(year_match.group(1)) if year_match else None
+                
+                current_framework = {
+                    'name': framework_name,
+                    'authors': framework_name.split()[0] if framework_name else '',
+                    'year': year,
+                    'title': '',
+                    'description': '',
+                    'source': '',
+                    'criteria': [],
+                }
             
-            if current_framework and criterion_col is not None and criterion_col < len(cells):
-                criterion_name = cells[criterion_col] if criterion_col < len(cells) else ''
-                definition_text = cells[definition_col] if definition_col is not None and definition_col < len(cells) else ''
+            if current_framework:
+                criterion_name = cells[criterion_col]
+                definition_text = cells[definition_col]
                 
                 if criterion_name:
                     current_framework['criteria'].append({
@@ -391,87 +694,14 @@ class Command(BaseCommand):
         url = None
         
         try:
-            # Get the document part for accessing relationships
-            doc_part = None
-            if hasattr(self, 'doc') and hasattr(self.doc, 'part'):
-                doc_part = self.doc.part
-            
-            # Iterate through paragraphs - hyperlinks are often at paragraph level
-            for paragraph in cell.paragraphs:
-                part = paragraph.part if hasattr(paragraph, 'part') else doc_part
-                if not part:
-                    continue
-                
-                # Check paragraph element for hyperlink children
-                para_elem = paragraph._element
-                for child in para_elem:
-                    # Check if this child is a hyperlink element
-                    if child.tag and 'hyperlink' in child.tag:
-                        # Get relationship ID (rId) - this is for external links
-                        r_id = child.get('{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                        if r_id and part and hasattr(part, 'rels'):
-                            try:
-                                rel = part.rels.get(r_id)
-                                if rel:
-                                    # Get the target URL - try different attribute names
-                                    if hasattr(rel, 'target_ref'):
-                                        url = rel.target_ref
-                                    elif hasattr(rel, '_target'):
-                                        url = str(rel._target)
-                                    elif hasattr(rel, 'target_uri'):
-                                        url = str(rel.target_uri)
-                                    elif hasattr(rel, 'target'):
-                                        url = str(rel.target)
-                                    
-                                    # If we found a URL, return it immediately
-                                    if url:
-                                        return (text, url)
-                            except Exception as e:
-                                # Continue trying other methods
-                                pass
+            # Hyperlinks of the cell's own paragraphs, including any nested in runs
+            for hyperlink in _cell_hyperlinks_xpath()(cell._element):
+                # Resolve the relationship ID (rId) - this is for external links
+                url = self.rel_targets.get(hyperlink.get(_RID_ATTR))
                 
-                # Also check runs for hyperlinks (some documents might have them nested differently)
-                for run in paragraph.runs:
-                    run_elem = run._element
-                    
-                    # Look for hyperlink elements in the run (recursively)
-                    def find_hyperlinks(elem):
-                        """Recursively find hyperlink elements"""
-                        hyperlinks = []
-                        # Check if this element is a hyperlink
-                        if elem.tag and 'hyperlink' in elem.tag:
-                            hyperlinks.append(elem)
-                        # Check children
-                        for child in elem:
-                            hyperlinks.extend(find_hyperlinks(child))
-                        return hyperlinks
-                    
-                    hyperlinks = find_hyperlinks(run_elem)
-                    
-                    for hyperlink in hyperlinks:
-                        # Check for relationship ID (rId) - this is for external links
-                        r_id = hyperlink.get('{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id')
-                        if r_id and part and hasattr(part, 'rels'):
-                            try:
-                                rel = part.rels.get(r_id)
-                                if rel:
-                                    # Get the target URL - try different attribute names
-                                    if hasattr(rel, 'target_ref'):
-                                        url = rel.target_ref
-                                    elif hasattr(rel, '_target'):
-                                        url = str(rel._target)
-                                    elif hasattr(rel, 'target_uri'):
-                                        url = str(rel.target_uri)
-                                    elif hasattr(rel, 'target'):
-                                        url = str(rel.target)
-                                    
-                                    # If we found a URL, return it immediately
-                                    if url:
-                                        return (text, url)
-                            except Exception as e:
-                                # Continue trying other methods
-                                pass
-                        
+                # If we found a URL, return it immediately
+                if url:
+                    return (text, url)
         except Exception as e:
             # If hyperlink extraction fails, just return the text
             # This is a fallback to ensure the import doesn't break
@@ -479,79 +709,84 @@ class Command(BaseCommand):
         
         return (text, url)
     
+    def iter_table_rows(self, table):
+        """
+        Yield the cells of each table row. Tables without merged cells are read
+        straight from their <w:tc> elements; otherwise python-docx's row.cells
+        resolves the spans.
+        """
+        tbl = table._tbl
+        if tbl.xpath('.//w:gridSpan | .//w:vMerge'):
+            for row in table.rows:
+                yield row.cells
+        else:
+            _Cell = _lazy_import('docx.table', '_Cell')
+            for tr in tbl.tr_lst:
+                yield tuple(_Cell(tc, table) for tc in tr.tc_lst)
+
     def parse_table(self, table):
         """Parse DOCX table to extract framework data"""
         frameworks_data = []
         
-        if not table.rows or len(table.rows) < 2:
+        if len(table._tbl.tr_lst) < 2:
             return frameworks_data
         
+        rows = self.iter_table_rows(table)
+        
         # Get header row
-        header_row = table.rows[0]
-        headers = [cell.text.strip().lower() for cell in header_row.cells]
-        
-        # Find column indices for our specific table structure
-        title_col = None
-        year_col = None
-        dimensions_col = None
-        abstract_col = None
-        objectives_col = None
-        methodology_col = None
-        algorithm_col = None
-        top_model_col = None
-        accuracy_col = None
-        advantages_col = None
-        drawbacks_col = None
-        reference_col = None
+        header_row = next(rows)
+        headers = [cell.text.strip().lower() for cell in header_row]
         
+        # Find column indices for our specific table structure; a later header
+        # naming the same column wins
+        columns = {}
         for i, header in enumerate(headers):
-            if 'title' in header:
-                title_col = i
-            elif 'year' in header or 'published' in header:
-                year_col = i
-            elif 'dimension' in header:
-                dimensions_col = i
-            elif 'abstract' in header:
-                abstract_col = i
-            elif 'objective' in header:
-                objectives_col = i
-            elif 'methodology' in header:
-                methodology_col = i
-            elif 'algorithm' in header:
-                algorithm_col = i
-            elif 'top model' in header or 'topmodel' in header.replace(' ', '').lower():
-                top_model_col = i
-            elif 'accuracy' in header:
-                accuracy_col = i
-            elif 'advantage' in header:
-                advantages_col = i
-            elif 'drawback' in header:
-                drawbacks_col = i
-            elif 'reference' in header:
-                reference_col = i
+            compact_header = header.replace(' ', '')
+            for needle, column in _HEADER_COLUMNS.items():
+                if needle in (compact_header if needle in _COMPACT_HEADER_KEYS else header):
+                    columns[column] = i
+                    break
+        
+        # Rows are padded to cover every found column and get one extra blank cell
+        # at the end; columns missing from the header read that cell (index -1)
+        width = max(columns.values(), default=-1) + 1
+        title_col = columns.get('title', -1)
+        year_col = columns.get('year', -1)
+        dimensions_col = columns.get('dimensions', -1)
+        abstract_col = columns.get('abstract', -1)
+        objectives_col = columns.get('objectives', -1)
+        methodology_col = columns.get('methodology', -1)
+        algorithm_col = columns.get('algorithm', -1)
+        top_model_col = columns.get('top_model', -1)
+        accuracy_col = columns.get('accuracy', -1)
+        advantages_col = columns.get('advantages', -1)
+        drawbacks_col = columns.get('drawbacks', -1)
+        reference_col = columns.get('reference')
         
         # Parse each data row
-        for row in table.rows[1:]:  # Skip header
+        for row in rows:  # Header already consumed
             # Extract text from all cells first
-            cells = [cell.text.strip() for cell in row.cells]
+            cells = [cell.text.strip() for cell in row]
+            cells.extend([''] * (width - len(cells)))
+            cells.append('')
             
             # Extract framework information
-            title = cells[title_col] if title_col is not None and title_col < len(cells) else ''
-            year_str = cells[year_col] if year_col is not None and year_col < len(cells) else ''
-            dimensions = cells[dimensions_col] if dimensions_col is not None and dimensions_col < len(cells) else ''
-            abstract = cells[abstract_col] if abstract_col is not None and abstract_col < len(cells) else ''
-            objectives = cells[objectives_col] if objectives_col is not None and objectives_col < len(cells) else ''
-            methodology = cells[methodology_col] if methodology_col is not None and methodology_col < len(cells) else ''
-            algorithm_used = cells[algorithm_col] if algorithm_col is not None and algorithm_col < len(cells) else ''
-            top_model = cells[top_model_col] if top_model_col is not None and top_model_col < len(cells) else ''
-            accuracy = cells[accuracy_col] if accuracy_col is not None and accuracy_col < len(cells) else ''
-            advantages = cells[advantages_col] if advantages_col is not None and advantages_col < len(cells) else ''
-            drawbacks = cells[drawbacks_col] if drawbacks_col is not None and drawbacks_col < len(cells) else ''
+            title = cells[title_col]
+            year_str = cells[year_col]
+            dimensions = cells[dimensions_col]
+            abstract = cells[abstract_col]
+            objectives = cells[objectives_col]
+            methodology = cells[methodology_col]
+            algorithm_used = cells[algorithm_col]
+            top_model = cells[top_model_col]
+            accuracy = cells[accuracy_col]
+            advantages = cells[advantages_col]
+            drawbacks = cells[drawbacks_col]
             
             # Extract reference with hyperlink support
             reference = ''
-            if reference_col is not None and reference_col < len(row.cells):
-                ref_cell = row.cells[reference_col]
+            if reference_col is not None and reference_col < len(row):
+                ref_cell = row[reference_col]
                 ref_text, ref_url = self.extract_hyperlinks_from_cell(ref_cell)
                 
                 # Combine text and URL appropriately
@@ -585,23 +820,11 @@ class Command(BaseCommand):
                 continue
             
             # Extract year
-            year = None
-            if year_str:
-                year_match = re.search(r'(\d{4})', year_str)
-                if year_match:
-                    try:
-                        year = int(year_match.group(1))
-                    except ValueError:
-                        pass
+            year = extract_year(year_str, _YEAR_RE) if year_str else None
             
             # If no year found in year column, try to extract from title
             if not year:
-                year_match = re.search(r'\((\d{4})\)', title)
-                if year_match:
-                    try:
-                        year = int(year_match.group(1))
-                    except ValueError:
-                        pass
+                year = extract_year(title, _PAREN_YEAR_RE)
             
             # Extract authors from title or reference
             # Since reference column just says "Read", we'll try to extract from title
@@ -610,73 +833,44 @@ class Command(BaseCommand):
             
             # Try reference column first (though it usually just says "Read")
             if reference and reference.lower() != 'read':
-                author_match = re.search(r'^([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+et\s+al\.)?)', reference)
+                author_match = _AUTHOR_RE.search(reference)
                 if author_match:
                     authors = author_match.group(1).strip()
             
             # If no authors from reference, try title patterns
+            # If still no authors, leave empty (will be stored as empty string)
             if not authors and title:
-                # Look for common author patterns in titles
-                # Pattern: "Author et al. - Title" or "Author: Title"
-                title_clean = re.sub(r'\s*\(?\d{4}\)?', '', title)
-                
-                # Check if title starts with what looks like an author name (short, capitalized words)
-                parts = re.split(r'[:\-–]', title_clean, 1)
-                if parts and len(parts) > 0:
-                    first_part = parts[0].strip()
-                    words = first_part.split()
-                    # If first part is short (likely author), use it
-                    if len(words) <= 4 and len(first_part) < 50:
-                        # Check if it looks like an author name (starts with capital, has 2-4 words)
-                        if all(w[0].isupper() if w else False for w in words[:2]):
-                            authors = first_part
-                
-                # If still no authors, leave empty (will be stored as empty string)
+                authors = authors_from_title(title)
             
             # Parse dimensions/criteria
             criteria = []
             if dimensions:
-                # Normalize the dimensions string - replace newlines with spaces first
-                dimensions_normalized = re.sub(r'\s+', ' ', dimensions)
-                
-                # Handle special cases where words are split (e.g., "Syntactic\nValidity" -> "Syntactic Validity")
-                # Join words that might have been split: "Syntactic Validity", "Semantic Accuracy", etc.
-                dimensions_normalized = re.sub(r'\b(Syntactic|Semantic|Representational)\s+([A-Z][a-z]+)', r'\1 \2', dimensions_normalized)
-                
-                # Split by comma, semicolon, or newline
-                dim_list = re.split(r'[,;\n]+', dimensions_normalized)
+                # Split by comma or semicolon; newlines inside an item are only line wraps
+                # (e.g. "Syntactic\nValidity" -> "Syntactic Validity")
+                dim_list = _DIMENSION_SEPARATOR_RE.split(dimensions)
                 
                 seen_dimensions = set()  # Avoid duplicates
                 
-                for dim in dim_list:
-                    dim = dim.strip()
-                    # Filter out very short strings and common non-dimension words
-                    if dim and len(dim) > 2 and dim.lower() not in ['n/a', 'na', 'read', 'and', 'or', 'the', 'none', 'null']:
-                        # Clean up common prefixes that might be split across lines
-                        dim = re.sub(r'^(Syntactic|Semantic|Representational)[\s-]+', '', dim, flags=re.IGNORECASE)
-                        # Remove trailing periods, dashes, and parentheses
-                        dim = dim.rstrip('.-()[]').strip()
+                for item in dim_list:
+                    dim = clean_dimension(item)
+                    if not dim:
+                        continue
+                    
+                    # Avoid duplicates (case-insensitive)
+                    dim_lower = dim.lower()
+                    if dim_lower not in seen_dimensions:
+                        seen_dimensions.add(dim_lower)
+                        # Use abstract or description if available for better definition
+                        definition_text = abstract if abstract else f"Quality dimension from {title}"
+                        if year:
+                            definition_text += f" ({year})"
                         
-                        # Skip if it's just a single letter, number, or common words
-                        if dim and len(dim) > 2 and not re.match(r'^[\d\s]+$', dim):
-                            # Capitalize first letter
-                            dim = dim[0].upper() + dim[1:] if len(dim) > 1 else dim
-                            
-                            # Avoid duplicates (case-insensitive)
-                            dim_lower = dim.lower()
-                            if dim_lower not in seen_dimensions:
-                                seen_dimensions.add(dim_lower)
-                                # Use abstract or description if available for better definition
-                                definition_text = abstract if abstract else f"Quality dimension from {title}"
-                                if year:
-                                    definition_text += f" ({year})"
-                                
-                                criteria.append({
-                                    'name': dim,
-                                    'description': definition_text,
-                                    'category': '',
-                                    'definitions': [definition_text],
-                                })
+                        criteria.append({
+                            'name': dim,
+                            'description': definition_text,
+                            'category': '',
+                            'definitions': [definition_text],
+                        })
             
             # Create framework entry
             framework_data = {
@@ -706,87 +900,118 @@ class Command(BaseCommand):
             return ''
         return ' '.join(name.lower().strip().split())
     
-    def find_matching_framework(self, fw_data):
+    def build_framework_index(self):
+        """Load every framework once, keyed for the lookups in find_matching_framework"""
+        index = {
+            'name': defaultdict(list),
+            'normalized_name': defaultdict(list),
+            'year': defaultdict(list),
+        }
+        for fw in Framework.objects.all():
+            self.add_to_framework_index(index, fw)
+        return index
+    
+    def add_to_framework_index(self, index, fw):
+        index['name'][fw.name].append(fw)
+        index['normalized_name'][self.normalize_name(fw.name)].append(fw)
+        index['year'][fw.year].append(fw)
+    
+    def first_framework(self, candidates):
+        """
+        The candidate .first() would return under Framework's ordering (-year, name),
+        with NULL years last as in SQLite. Ties keep load order, i.e. creation order.
+        """
+        if not candidates:
+            return None
+        return min(candidates, key=lambda fw: (fw.year is None, -(fw.year or 0), fw.name))
+    
+    def find_matching_framework(self, fw_data, index):
         """Find existing framework by normalized name, year, or title"""
         name = fw_data.get('name', '').strip()
         year = fw_data.get('year')
         title = fw_data.get('title', '').strip()
         
         # Try exact name match first
-        framework = Framework.objects.filter(name=name).first()
+        framework = self.first_framework(index['name'].get(name))
         if framework:
             return framework
         
         # Try normalized name match
         normalized_name = self.normalize_name(name)
         if normalized_name:
-            for fw in Framework.objects.all():
-                if self.normalize_name(fw.name) == normalized_name:
-                    return fw
+            framework = self.first_framework(index['normalized_name'].get(normalized_name))
+            if framework:
+                return framework
+        
+        # Merges can change a year, so bucket entries are re-checked
+        same_year = [fw for fw in index['year'].get(year, ()) if fw.year == year] if year else []
         
         # Try matching by year and title (if both exist)
         if year and title:
-            framework = Framework.objects.filter(year=year, title=title).first()
+            framework = self.first_framework([fw for fw in same_year if fw.title == title])
             if framework:
                 return framework
         
         # Try matching by year and normalized title
         if year and title:
             normalized_title = self.normalize_name(title)
-            for fw in Framework.objects.filter(year=year):
-                if self.normalize_name(fw.title) == normalized_title:
-                    return fw
+            framework = self.first_framework([fw for fw in same_year if self.normalize_name(fw.title) == normalized_title])
+            if framework:
+                return framework
         
         return None
     
     def merge_framework_data(self, framework, fw_data):
-        """Merge new data into existing framework, keeping existing data if new is empty"""
-        updated = False
+        """
+        Merge new data into an existing framework, keeping existing data if new is empty.
+        Returns the names of the fields that changed; nothing is saved here.
+        """
+        changed = set()
         
         # Only update if new data is not empty and different
         if fw_data.get('authors') and fw_data['authors'].strip() and (not framework.authors or framework.authors.strip() != fw_data['authors'].strip()):
             framework.authors = fw_data['authors'].strip()
-            updated = True
+            changed.add('authors')
         
         if fw_data.get('year') and framework.year != fw_data['year']:
             framework.year = fw_data['year']
-            updated = True
+            changed.add('year')
         
         if fw_data.get('title') and fw_data['title'].strip() and (not framework.title or framework.title.strip() != fw_data['title'].strip()):
             framework.title = fw_data['title'].strip()
-            updated = True
+            changed.add('title')
         
         if fw_data.get('description') and fw_data['description'].strip() and (not framework.description or len(fw_data['description'].strip()) > len(framework.description.strip())):
             framework.description = fw_data['description'].strip()
-            updated = True
+            changed.add('description')
         
         if fw_data.get('objectives') and fw_data['objectives'].strip() and (not framework.objectives or len(fw_data['objectives'].strip()) > len(framework.objectives.strip())):
             framework.objectives = fw_data['objectives'].strip()
-            updated = True
+            changed.add('objectives')
         
         if fw_data.get('methodology') and fw_data['methodology'].strip() and (not framework.methodology or len(fw_data['methodology'].strip()) > len(framework.methodology.strip())):
             framework.methodology = fw_data['methodology'].strip()
-            updated = True
+            changed.add('methodology')
         
         if fw_data.get('algorithm_used') and fw_data['algorithm_used'].strip() and (not framework.algorithm_used or framework.algorithm_used.strip() != fw_data['algorithm_used'].strip()):
             framework.algorithm_used = fw_data['algorithm_used'].strip()
-            updated = True
+            changed.add('algorithm_used')
         
         if fw_data.get('top_model') and fw_data['top_model'].strip() and (not framework.top_model or framework.top_model.strip() != fw_data['top_model'].strip()):
             framework.top_model = fw_data['top_model'].strip()
-            updated = True
+            changed.add('top_model')
         
         if fw_data.get('accuracy') and fw_data['accuracy'].strip() and (not framework.accuracy or framework.accuracy.strip() != fw_data['accuracy'].strip()):
             framework.accuracy = fw_data['accuracy'].strip()
-            updated = True
+            changed.add('accuracy')
         
         if fw_data.get('advantages') and fw_data['advantages'].strip() and (not framework.advantages or len(fw_data['advantages'].strip()) > len(framework.advantages.strip())):
             framework.advantages = fw_data['advantages'].strip()
-            updated = True
+            changed.add('advantages')
         
         if fw_data.get('drawbacks') and fw_data['drawbacks'].strip() and (not framework.drawbacks or len(fw_data['drawbacks'].strip()) > len(framework.drawbacks.strip())):
             framework.drawbacks = fw_data['drawbacks'].strip()
-            updated = True
+            changed.add('drawbacks')
         
         if fw_data.get('source') and fw_data['source'].strip():
             new_source = fw_data['source'].strip()
@@ -807,12 +1032,9 @@ class Command(BaseCommand):
             
             if should_update:
                 framework.source = new_source
-                updated = True
-        
-        if updated:
-            framework.save()
+                changed.add('source')
         
-        return updated
+        return changed
     
     def normalize_criterion_name(self, name):
         """Normalize criterion name for comparison"""
@@ -825,29 +1047,93 @@ class Command(BaseCommand):
             normalized = normalized[0].upper() + normalized[1:] if len(normalized) > 1 else normalized.upper()
         return normalized
     
-    def find_matching_criterion(self, framework, criterion_name):
+    def build_criterion_index(self, frameworks):
+        """
+        Load the criteria of the given frameworks and their definitions, two
+        queries per batch of frameworks. Returns the criteria per framework pk,
+        keyed by exact and by normalized name, and the normalized definition
+        texts per criterion.
+        """
+        index = defaultdict(lambda: {'name': {}, 'normalized_name': defaultdict(list)})
+        # Keyed by id(): criteria created by this import aren't saved yet, so they aren't hashable
+        definition_texts = {}
+        
+        pks = sorted({framework.pk for framework in frameworks})
+        definitions = Prefetch('definitions', queryset=Definition.objects.only('id', 'criterion_id', 'definition_text'))
+        # Batched to stay under the database's query parameter limit
+        for start in range(0, len(pks), BATCH_SIZE):
+            criteria = Criterion.objects.filter(framework_id__in=pks[start:start + BATCH_SIZE]).prefetch_related(definitions)
+            for criterion in criteria:
+                self.add_to_criterion_index(index, criterion)
+                definition_texts[id(criterion)] = [
+                    self.normalize_name(definition.definition_text) for definition in criterion.definitions.all()
+                ]
+        return index, definition_texts
+    
+    def add_to_criterion_index(self, index, criterion):
+        criteria = index[criterion.framework_id]
+        criteria['name'][criterion.name] = criterion
+        criteria['normalized_name'][self.normalize_criterion_name(criterion.name)].append(criterion)
+    
+    def find_matching_criterion(self, framework, criterion_name, index):
         """Find existing criterion by normalized name"""
         normalized_name = self.normalize_criterion_name(criterion_name)
         if not normalized_name:
             return None
+        criteria = index[framework.pk]
         
-        # Try exact match first
-        criterion = Criterion.objects.filter(framework=framework, name=criterion_name).first()
+        # Try exact match first; (framework, name) is unique
+        criterion = criteria['name'].get(criterion_name)
         if criterion:
             return criterion
         
-        # Try normalized match
-        for crit in Criterion.objects.filter(framework=framework):
-            if self.normalize_criterion_name(crit.name) == normalized_name:
-                return crit
+        # Try normalized match, first in Criterion's (order, name) ordering
+        candidates = criteria['normalized_name'].get(normalized_name)
+        if candidates:
+            return min(candidates, key=lambda crit: (crit.order, crit.name))
         
         return None
     
+    def is_duplicate_definition(self, normalized_def, existing_texts):
+        """True if the normalized text equals, or is a similar-length substring/superstring of, an existing one"""
+        for existing_normalized in existing_texts:
+            # Check if one is a substring of the other (likely duplicate)
+            if normalized_def in existing_normalized or existing_normalized in normalized_def:
+                if abs(len(normalized_def) - len(existing_normalized)) < 20:  # Similar length
+                    return True
+        return False
+    
+    def insert_all(self, model, objects):
+        """bulk_create that still sets primary keys on backends which can't return them"""
+        if connection.features.can_return_rows_from_bulk_insert:
+            model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+        else:
+            for obj in objects:
+                obj.save()
+    
+    def update_all(self, model, updated):
+        """bulk_update (instance, changed fields) pairs, touching updated_at"""
+        objects = []
+        fields = {'updated_at'}
+        now = timezone.now()
+        for obj, changed in updated:
+            obj.updated_at = now
+            objects.append(obj)
+            fields |= changed
+        if objects:
+            model.objects.bulk_update(objects, sorted(fields), batch_size=BATCH_SIZE)
+    
     def import_frameworks(self, frameworks_data):
         """Import frameworks data into the database with duplicate detection"""
         imported_count = 0
         updated_count = 0
         
+        # Frameworks are matched and merged in memory first, then written in bulk
+        index = self.build_framework_index()
+        new_frameworks = []
+        updated_frameworks = {}  # pk -> (framework, changed fields)
+        resolved = []
+        
         for fw_data in frameworks_data:
             # Normalize framework name
             fw_data['name'] = fw_data.get('name', '').strip()
@@ -856,18 +1142,25 @@ class Command(BaseCommand):
                 continue
             
             # Try to find existing framework
-            framework = self.find_matching_framework(fw_data)
+            framework = self.find_matching_framework(fw_data, index)
             
             if framework:
                 # Update existing framework
-                was_updated = self.merge_framework_data(framework, fw_data)
-                if was_updated:
+                old_year = framework.year
+                changed = self.merge_framework_data(framework, fw_data)
+                if changed:
                     updated_count += 1
                     self.stdout.write(f'Updated framework: {framework.name}')
+                    # Frameworks created by this import are inserted with their merged values
+                    if framework.pk is not None:
+                        updated_frameworks.setdefault(framework.pk, (framework, set()))[1].update(changed)
+                    if framework.year != old_year:
+                        index['year'][framework.year].append(framework)
             else:
                 # Create new framework
-                framework = Framework.objects.create(
+                framework = Framework(
                     name=fw_data['name'],
+                    name_normalized=normalize_name(fw_data['name']),
                     authors=fw_data.get('authors', '').strip(),
                     year=fw_data.get('year'),
                     title=fw_data.get('title', '').strip(),
@@ -881,9 +1174,24 @@ class Command(BaseCommand):
                     drawbacks=fw_data.get('drawbacks', '').strip(),
                     source=fw_data.get('source', '').strip(),
                 )
+                new_frameworks.append(framework)
+                self.add_to_framework_index(index, framework)
                 imported_count += 1
                 self.stdout.write(f'Created framework: {framework.name}')
             
+            resolved.append((framework, fw_data))
+        
+        # Criteria need the new frameworks' primary keys
+        self.insert_all(Framework, new_frameworks)
+        self.update_all(Framework, updated_frameworks.values())
+        
+        # Criteria and definitions are likewise matched in memory and written in bulk
+        criterion_index, definition_texts = self.build_criterion_index(framework for framework, _ in resolved)
+        new_criteria = []
+        updated_criteria = {}  # pk -> (criterion, changed fields)
+        new_definitions = []
+        
+        for framework, fw_data in resolved:
             # Import criteria with duplicate detection
             for idx, criterion_data in enumerate(fw_data.get('criteria', [])):
                 criterion_name = criterion_data.get('name', '').strip()
@@ -894,60 +1202,56 @@ class Command(BaseCommand):
                 normalized_name = self.normalize_criterion_name(criterion_name)
                 
                 # Try to find existing criterion
-                criterion = self.find_matching_criterion(framework, criterion_name)
+                criterion = self.find_matching_criterion(framework, criterion_name, criterion_index)
                 
                 if criterion:
                     # Update existing criterion if new data is better
+                    changed = set()
                     if criterion_data.get('description') and criterion_data['description'].strip():
                         if not criterion.description or len(criterion_data['description'].strip()) > len(criterion.description.strip()):
                             criterion.description = criterion_data['description'].strip()
-                            criterion.save()
+                            changed.add('description')
                     if criterion_data.get('category') and criterion_data['category'].strip():
                         if not criterion.category or criterion.category.strip() != criterion_data['category'].strip():
                             criterion.category = criterion_data['category'].strip()
-                            criterion.save()
+                            changed.add('category')
+                    # Criteria created by this import are inserted with their merged values
+                    if changed and criterion.pk is not None:
+                        updated_criteria.setdefault(criterion.pk, (criterion, set()))[1].update(changed)
                 else:
                     # Create new criterion
-                    criterion = Criterion.objects.create(
+                    criterion = Criterion(
                         framework=framework,
                         name=normalized_name,
                         description=criterion_data.get('description', '').strip(),
                         category=criterion_data.get('category', '').strip(),
                         order=idx,
                     )
+                    new_criteria.append(criterion)
+                    self.add_to_criterion_index(criterion_index, criterion)
+                    definition_texts[id(criterion)] = []
                 
                 # Import definitions with duplicate detection
+                existing_texts = definition_texts[id(criterion)]
                 for definition_text in criterion_data.get('definitions', []):
                     definition_text = definition_text.strip()
                     if not definition_text:
                         continue
                     
-                    # Check if similar definition already exists (normalized comparison)
+                    # Only create if not the same as, or a near-duplicate of, an existing definition
                     normalized_def = self.normalize_name(definition_text)
-                    existing_def = None
-                    
-                    for def_obj in criterion.definitions.all():
-                        if self.normalize_name(def_obj.definition_text) == normalized_def:
-                            existing_def = def_obj
-                            break
-                    
-                    if not existing_def:
-                        # Only create if significantly different (avoid near-duplicates)
-                        is_duplicate = False
-                        for def_obj in criterion.definitions.all():
-                            existing_normalized = self.normalize_name(def_obj.definition_text)
-                            # Check if one is a substring of the other (likely duplicate)
-                            if normalized_def in existing_normalized or existing_normalized in normalized_def:
-                                if abs(len(normalized_def) - len(existing_normalized)) < 20:  # Similar length
-                                    is_duplicate = True
-                                    break
-                        
-                        if not is_duplicate:
-                            Definition.objects.create(
-                                criterion=criterion,
-                                definition_text=definition_text,
-                                notes='',
-                            )
+                    if not self.is_duplicate_definition(normalized_def, existing_texts):
+                        new_definitions.append(Definition(
+                            criterion=criterion,
+                            definition_text=definition_text,
+                            notes='',
+                        ))
+                        existing_texts.append(normalized_def)
+        
+        # Definitions need the new criteria's primary keys
+        self.insert_all(Criterion, new_criteria)
+        self.update_all(Criterion, updated_criteria.values())
+        Definition.objects.bulk_create(new_definitions, batch_size=BATCH_SIZE)
         
         self.stdout.write(self.style.SUCCESS(f'Imported {imported_count} new frameworks, updated {updated_count} existing frameworks'))
         return imported_count
@@ -13,6 +13,14 @@ from docx import Document
 import re
 from frameworks.models import Framework, Criterion, Definition
 
+# Compiled once rather than looked up in re's cache for every paragraph and row
+_FRAMEWORK_HEADER_RE = re.compile(r'([A-Z][a-z]+(?:\s+et\s+al\.)?)\s*(\d{4})?', re.IGNORECASE)
+_CRITERION_RES = (
+    re.compile(r'(Completeness|Accuracy|Consistency|Conciseness|Timeliness|Relevancy|Interoperability|Availability|Usability)', re.IGNORECASE),
+    re.compile(r'Criterion[:\s]+([A-Z][a-z]+)', re.IGNORECASE),
+)
+_YEAR_RE = re.compile(r'(\d{4})')
+
 
 class Command(BaseCommand):
     help = 'Import Knowledge Graph quality frameworks from a Word document'
@@ -72,7 +80,7 @@ class Command(BaseCommand):
             
             # Try to detect framework headers (customize based on your document format)
             # Example patterns: "Chen et al. 2019", "Framework: Li et al. 2023"
-            framework_match = re.search(r'([A-Z][a-z]+(?:\s+et\s+al\.)?)\s*(\d{4})?', text, re.IGNORECASE)
+            framework_match = _FRAMEWORK_HEADER_RE.search(text)
             if framework_match:
                 if current_framework:
                     frameworks_data.append(current_framework)
@@ -92,13 +100,8 @@ class Command(BaseCommand):
             elif current_framework:
                 # Try to detect criteria (customize based on your document format)
                 # Look for common criterion names
-                criterion_patterns = [
-                    r'(Completeness|Accuracy|Consistency|Conciseness|Timeliness|Relevancy|Interoperability|Availability|Usability)',
-                    r'Criterion[:\s]+([A-Z][a-z]+)',
-                ]
-                
-                for pattern in criterion_patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
+                for pattern in _CRITERION_RES:
+                    match = pattern.search(text)
                     if match:
                         criterion_name = match.group(1) if match.groups() else match.group(0)
                         current_framework['criteria'].append({
@@ -159,7 +162,7 @@ class Command(BaseCommand):
                         frameworks_data.append(current_framework)
                     
                     # Extract year from framework name if present
-                    year_match = re.search(r'(\d{4})', framework_name)
+                    year_match = _YEAR_RE.search(framework_name)
                     year = int(year_match.group(1)) if year_match else None
                     
                     current_framework = {
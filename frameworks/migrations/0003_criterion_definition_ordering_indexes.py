@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frameworks', '0002_framework_accuracy_framework_advantages_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='criterion',
+            index=models.Index(fields=['framework', 'order', 'name'], name='frameworks__framewo_fdc78f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='definition',
+            index=models.Index(fields=['criterion', '-created_at'], name='frameworks__criteri_79b463_idx'),
+        ),
+    ]
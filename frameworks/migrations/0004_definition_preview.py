@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:30
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frameworks', '0003_criterion_definition_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='definition',
+            name='preview',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Left('definition_text', 101), output_field=models.CharField(max_length=101)),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frameworks', '0004_definition_preview'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='definition',
+            index=models.Index(fields=['created_at'], name='frameworks__created_ca519b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='framework',
+            index=models.Index(fields=['created_at'], name='frameworks__created_0d47a5_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-15 05:00
+
+from django.db import migrations, models
+
+
+def fill_name_normalized(apps, schema_editor):
+    Framework = apps.get_model('frameworks', 'Framework')
+    frameworks = list(Framework.objects.only('id', 'name'))
+    for framework in frameworks:
+        framework.name_normalized = ' '.join((framework.name or '').lower().strip().split())
+    Framework.objects.bulk_update(frameworks, ['name_normalized'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('frameworks', '0005_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='framework',
+            name='name_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_name_normalized, migrations.RunPython.noop),
+    ]
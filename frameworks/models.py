@@ -1,10 +1,20 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db.models.functions import Left
+
+
+def normalize_name(name):
+    """Normalize a name for comparison: lowercase with whitespace collapsed"""
+    if not name:
+        return ''
+    return ' '.join(name.lower().strip().split())
 
 
 class Framework(models.Model):
     """Represents a Knowledge Graph quality framework from literature"""
     name = models.CharField(max_length=200, help_text="Name of the framework (e.g., 'Chen et al. 2019')")
+    # normalize_name(name), kept in sync by save(); lets duplicate names be grouped in the database
+    name_normalized = models.CharField(max_length=200, blank=True, db_index=True, editable=False)
     authors = models.CharField(max_length=500, blank=True, help_text="Authors of the framework")
     year = models.IntegerField(
         validators=[MinValueValidator(1900), MaxValueValidator(2100)],
@@ -30,11 +40,20 @@ class Framework(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['year']),
+            # Backs the admin created_at date filter's range lookups
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
         return f"{self.name} ({self.year})" if self.year else self.name
 
+    def save(self, *args, **kwargs):
+        self.name_normalized = normalize_name(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'name_normalized'}
+        super().save(*args, **kwargs)
+
 
 class Criterion(models.Model):
     """Represents a quality criterion/metric in a framework"""
@@ -52,6 +71,8 @@ class Criterion(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['framework', 'name']),
+            # Matches the admin changelist ordering
+            models.Index(fields=['framework', 'order', 'name']),
         ]
 
     def __str__(self):
@@ -62,12 +83,22 @@ class Definition(models.Model):
     """Represents a definition of a criterion, which may vary across frameworks"""
     criterion = models.ForeignKey(Criterion, on_delete=models.CASCADE, related_name='definitions')
     definition_text = models.TextField(help_text="The definition text")
+    # One character past the displayed 100 so truncation can be detected without reading the full text
+    preview = models.GeneratedField(
+        expression=Left('definition_text', 101),
+        output_field=models.CharField(max_length=101),
+        db_persist=True,
+    )
     notes = models.TextField(blank=True, help_text="Additional notes or context")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['criterion', 'id']
+        indexes = [
+            models.Index(fields=['criterion', '-created_at']),
+            models.Index(fields=['created_at']),
+        ]
 
     def __str__(self):
         return f"Definition for {self.criterion.name}"
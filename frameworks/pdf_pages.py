@@ -0,0 +1,45 @@
+"""
+Per-page PDF extraction with pdfplumber.
+
+This module deliberately imports nothing from Django so that its functions
+can run in worker processes started with spawn or forkserver, where the
+app registry is never set up.
+"""
+# The PDF opened once per worker process by init_worker, and its table setting
+_worker_pdf = None
+_worker_skip_tables = False
+
+
+def extract_page(page, skip_tables=False):
+    """Return (text, tables) for a pdfplumber page and drop its cached layout objects"""
+    text = page.extract_text()
+    # With the default settings tables are only found along ruling lines and
+    # rectangle edges, so a page without any edges cannot contain one
+    if skip_tables or not page.edges:
+        tables = []
+    else:
+        tables = page.extract_tables()
+    page.flush_cache()
+    return text, tables
+
+
+def init_worker(pdf_path, skip_tables=False):
+    """ProcessPoolExecutor initializer: open the PDF once per worker"""
+    global _worker_pdf, _worker_skip_tables
+    import pdfplumber
+    _worker_pdf = pdfplumber.open(pdf_path)
+    _worker_skip_tables = skip_tables
+
+
+def extract_worker_page(page_index):
+    """Extract one page of the PDF opened by init_worker"""
+    return extract_page(_worker_pdf.pages[page_index], _worker_skip_tables)
+
+
+def page_batch_size(page_count):
+    """Pages handed to a worker at a time; larger documents use bigger batches"""
+    if page_count <= 10:
+        return 5
+    if page_count <= 200:
+        return 10
+    return 20
@@ -0,0 +1,91 @@
+"""
+Full-text search support for the admin, backed by SQLite FTS5.
+
+Each indexed model gets an external-content FTS5 table that mirrors the
+searched columns and is kept current by INSERT/UPDATE/DELETE triggers.
+On other database backends nothing is installed and callers fall back
+to Django's regular LIKE-based search.
+"""
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# FTS table name -> (source table, indexed columns)
+FTS_TABLES = {
+    'frameworks_framework_fts': ('frameworks_framework', ['name', 'authors', 'title', 'description']),
+    'frameworks_definition_fts': ('frameworks_definition', ['definition_text', 'notes']),
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def fts_available(connection):
+    """Return True if the connection supports the FTS tables"""
+    return connection.vendor == 'sqlite'
+
+
+def build_match_expression(search_term):
+    """
+    Turn a free-text admin search into an FTS5 MATCH expression.
+    Every word must match as a prefix, e.g. 'complete acc' -> '"complete"* "acc"*'.
+    """
+    tokens = _TOKEN_RE.findall(search_term or '')
+    if not tokens:
+        return None
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def _trigger_sql(fts_table, source_table, columns):
+    cols = ', '.join(columns)
+    new_vals = ', '.join(f'new.{c}' for c in columns)
+    old_vals = ', '.join(f'old.{c}' for c in columns)
+    insert_new = f"INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.id, {new_vals});"
+    delete_old = f"INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});"
+    return {
+        f'{fts_table}_ai': f"CREATE TRIGGER {fts_table}_ai AFTER INSERT ON {source_table} BEGIN {insert_new} END",
+        f'{fts_table}_ad': f"CREATE TRIGGER {fts_table}_ad AFTER DELETE ON {source_table} BEGIN {delete_old} END",
+        f'{fts_table}_au': f"CREATE TRIGGER {fts_table}_au AFTER UPDATE ON {source_table} BEGIN {delete_old} {insert_new} END",
+    }
+
+
+def install_fts(connection):
+    """
+    Create any missing FTS tables and triggers, rebuilding an index when
+    its triggers had to be (re)created. SQLite drops triggers whenever a
+    migration remakes the source table, so this is safe to run after every
+    migrate.
+    """
+    if not fts_available(connection):
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        existing = {row[0] for row in cursor.fetchall()}
+
+        for fts_table, (source_table, columns) in FTS_TABLES.items():
+            if source_table not in existing:
+                continue
+
+            needs_rebuild = False
+            if fts_table not in existing:
+                cursor.execute(
+                    f"CREATE VIRTUAL TABLE {fts_table} USING fts5("
+                    f"{', '.join(columns)}, content='{source_table}', content_rowid='id')"
+                )
+                needs_rebuild = True
+
+            for trigger_name, sql in _trigger_sql(fts_table, source_table, columns).items():
+                if trigger_name not in existing:
+                    cursor.execute(sql)
+                    needs_rebuild = True
+
+            if needs_rebuild:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+                logger.info(f"Rebuilt full-text index {fts_table}")
+
+
+def install_fts_after_migrate(sender, using, **kwargs):
+    """post_migrate handler"""
+    from django.db import connections
+    install_fts(connections[using])
@@ -126,6 +126,21 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Caches
+# The 'llm' cache persists LLM responses and sentence embeddings across
+# restarts so repeated comparisons skip the network/model entirely.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'llm': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / '.llm_cache',
+        'TIMEOUT': 60 * 60 * 24 * 30,
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    },
+}
+
 # Hugging Face API Key (for LLM enhancement)
 # Set via environment variable: export HUGGINGFACE_API_KEY="your-key-here"
 # Or uncomment and set below (NOT RECOMMENDED for production):